@@ -2,19 +2,30 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import os
-import hashlib
 from PIL import Image, ImageTk, ImageDraw
-from database import (verify_user, get_all_professors, get_professor_by_name,
-                     delete_professor, update_professor_picture, get_all_users,
-                     add_user, delete_user, add_professor, get_professor_schedule,
+from database import (verify_user, get_professor_by_id,
+                     get_professor_directory, search_professors as db_search_professors,
+                     available_professors, find_schedule_conflicts,
+                     delete_professor_by_id, delete_professors,
+                     update_professor_picture_by_id,
+                     get_professors_page, get_users_page, get_change_marker,
+                     add_user, get_user_by_id, delete_user_by_id, add_professor, get_professor_schedule,
                      add_schedule as db_add_schedule, delete_schedule, get_schedules_by_day,
-                     update_professor_schedule, update_professor, close_db,
-                     update_single_schedule, get_db_connection)
+                     update_professor_schedule_by_id, update_professor_by_id, close_db,
+                     update_single_schedule, parse_time_range,
+                     create_session, resume_session, end_session, purge_expired_sessions)
 from tkinter import filedialog
 import shutil
 import time
-import json
 import re
+from app_logging import configure_logging, get_logger
+from ui_worker import DbWorker, PagedTreeLoader
+
+logger = get_logger('ui')
+
+_CARDS_PER_FRAME = 20  # Professor cards are heavy; build a few per frame
+_REMEMBER_FILE = 'remembered_login.txt'  # Holds the remember-me session token
+_SESSION_PURGE_MS = 6 * 60 * 60 * 1000  # Expired sessions are purged every 6 hours
 
 class LoginWindow:
     def __init__(self, root):
@@ -26,6 +37,7 @@ class LoginWindow:
         self.username_var = tk.StringVar()
         self.password_var = tk.StringVar()
         self.remember_var = tk.BooleanVar()
+        self.db_worker = DbWorker(root)
         
         # Define colors
         self.colors = {
@@ -41,46 +53,28 @@ class LoginWindow:
         # Configure root window
         self.root.configure(bg=self.colors['background'])
         
-        # Add credentials file path
-        self.credentials_file = 'user_credentials.json'
-        
         # Create main container
         self.setup_main_container()
         
-        # Initialize or load credentials
-        self.initialize_credentials()
-        
         # Bind destroy event
         self.root.protocol("WM_DELETE_WINDOW", self.on_destroy)
         
-        # Try to load remembered credentials
-        if os.path.exists('remembered_login.txt'):
-            try:
-                with open('remembered_login.txt', 'r') as f:
-                    saved_username = f.readline().strip()
-                    saved_hash = f.readline().strip()
-                    if saved_username and saved_hash:
-                        # Load credentials file to verify saved hash
-                        if os.path.exists(self.credentials_file):
-                            with open(self.credentials_file, 'r') as cred_file:
-                                credentials = json.load(cred_file)
-                                if saved_username in credentials:
-                                    stored_user = credentials[saved_username]
-                                    if isinstance(stored_user, dict) and stored_user.get('password') == saved_hash:
-                                        self.username_var.set(saved_username)
-                                        # Don't set the password var since we only have the hash
-                                        self.remember_var.set(True)
-            except Exception as e:
-                # Remove corrupted remember file
-                try:
-                    os.remove('remembered_login.txt')
-                except:
-                    pass
-        
-    def hash_password(self, password):
-        """Create a simple hash of the password"""
-        return hashlib.sha256(password.encode()).hexdigest()
-
+        # A remembered session logs straight in with one indexed lookup
+        token = read_remembered_token()
+        if token:
+            self.remember_var.set(True)
+            self.db_worker.submit('resume', resume_session, token,
+                                  on_success=self._finish_resume)
+        
+    def _finish_resume(self, result):
+        username, role = result
+        if username:
+            self.username_var.set(username)
+            self._open_dashboard(username, role)
+        else:
+            # Expired or revoked; the user logs in normally
+            forget_remembered_login()
+            
     def login(self):
         """Handle login attempt"""
         try:
@@ -91,29 +85,61 @@ class LoginWindow:
                 messagebox.showwarning("Warning", "Please fill in all fields")
                 return
                 
-            # Verify credentials
-            is_verified, role = verify_user(username, password)
+            # Verify credentials on a worker; the password KDF is slow
+            self.login_btn.config(state=tk.DISABLED, text="CHECKING...")
+            self.db_worker.submit(
+                'login', verify_user, username, password,
+                on_success=lambda result: self._finish_login(username, *result),
+                on_error=self._login_failed
+            )
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Login failed: {str(e)}")
             
+    def _login_failed(self, error):
+        self.login_btn.config(state=tk.NORMAL, text="LOGIN")
+        messagebox.showerror("Error", f"Login failed: {str(error)}")
+        
+    def _finish_login(self, username, is_verified, role):
+        """Open the dashboard once verify_user has answered"""
+        self.login_btn.config(state=tk.NORMAL, text="LOGIN")
+        try:
             if is_verified:
-                self.root.withdraw()  # Hide login window
-                
-                # Open appropriate dashboard based on role
-                if role == 'admin':
-                    admin_root = tk.Toplevel()
-                    AdminDashboard(admin_root, username)
-                    admin_root.protocol("WM_DELETE_WINDOW", 
-                        lambda: self.on_dashboard_close(admin_root))
+                # Either way the previous remembered session is revoked.
+                # Open the dashboard once that is done; doing so shuts
+                # this window's worker down
+                if self.remember_var.get():
+                    job, args = renew_remembered_login, (username,)
                 else:
-                    student_root = tk.Toplevel()
-                    StudentPanel(student_root, username)
-                    student_root.protocol("WM_DELETE_WINDOW", 
-                        lambda: self.on_dashboard_close(student_root))
+                    job, args = forget_remembered_login, ()
+                self.db_worker.submit(
+                    'session', job, *args,
+                    on_success=lambda _: self._open_dashboard(username, role),
+                    on_error=lambda e: self._open_dashboard(username, role)
+                )
             else:
                 messagebox.showerror("Error", "Invalid username or password")
                 
         except Exception as e:
             messagebox.showerror("Error", f"Login failed: {str(e)}")
             
+    def _open_dashboard(self, username, role):
+        """Hide the login window and open the dashboard for role"""
+        self.db_worker.shutdown()  # The dashboard has its own worker
+        self.root.withdraw()  # Hide login window
+        
+        # Open appropriate dashboard based on role
+        if role == 'admin':
+            admin_root = tk.Toplevel()
+            AdminDashboard(admin_root, username)
+            admin_root.protocol("WM_DELETE_WINDOW", 
+                lambda: self.on_dashboard_close(admin_root))
+        else:
+            student_root = tk.Toplevel()
+            StudentPanel(student_root, username)
+            student_root.protocol("WM_DELETE_WINDOW", 
+                lambda: self.on_dashboard_close(student_root))
+            
     def setup_main_container(self):
         # Step 1: Create main frame with padding
         self.main_frame = tk.Frame(self.root, bg=self.colors['background'])
@@ -320,68 +346,6 @@ class LoginWindow:
             self.password_entry.config(show='*')
             self.show_password_btn.config(text='Show')
             
-    def initialize_credentials(self):
-        """Initialize or load user credentials"""
-        try:
-            # Create new credentials file if it doesn't exist
-            if not os.path.exists(self.credentials_file):
-                default_credentials = {
-                    "admin": {
-                        "password": "240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9",
-                        "role": "admin"
-                    },
-                    "student": {
-                        "password": self.hash_password("student123"),
-                        "role": "student"
-                    }
-                }
-                with open(self.credentials_file, 'w') as f:
-                    json.dump(default_credentials, f, indent=4)
-                return
-
-            # Load and validate existing credentials
-            with open(self.credentials_file, 'r') as f:
-                credentials = json.load(f)
-
-            # Validate credentials format
-            if not isinstance(credentials, dict):
-                raise ValueError("Invalid credentials format")
-
-            # Ensure admin and student accounts exist with correct format
-            credentials["admin"] = {
-                "password": "240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9",
-                "role": "admin"
-            }
-            
-            credentials["student"] = {
-                "password": self.hash_password("student123"),
-                "role": "student"
-            }
-
-            # Save the validated/fixed credentials
-            with open(self.credentials_file, 'w') as f:
-                json.dump(credentials, f, indent=4)
-
-        except Exception as e:
-            # If there's any error, recreate the credentials file
-            default_credentials = {
-                "admin": {
-                    "password": "240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9",
-                    "role": "admin"
-                },
-                "student": {
-                    "password": self.hash_password("student123"),
-                    "role": "student"
-                }
-            }
-            with open(self.credentials_file, 'w') as f:
-                json.dump(default_credentials, f, indent=4)
-            messagebox.showwarning("Warning", "Credentials file has been reset.")
-    
-    def hash_password(self, password):
-        """Create a simple hash of the password"""
-        return hashlib.sha256(password.encode()).hexdigest()
-
     def show_register(self):
         # Hide main frame
         self.main_frame.destroy()
@@ -472,19 +436,22 @@ class LoginWindow:
             messagebox.showerror("Error", "Please enter a valid email address")
             return
             
-        try:
-            # Add user to database with email
-            if add_user(username, password, email, "student"):
-                messagebox.showinfo("Success", "Registration successful! You can now login.")
-                self.show_login()
-            else:
-                messagebox.showerror("Error", "Username already exists")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        # Add user to database with email; hashing runs on a worker
+        self.db_worker.submit(
+            'register', add_user, username, password, email, "student",
+            on_success=self._finish_register,
+            on_error=lambda e: messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        )
+        
+    def _finish_register(self, added):
+        if added:
+            messagebox.showinfo("Success", "Registration successful! You can now login.")
+            self.show_login()
+        else:
+            messagebox.showerror("Error", "Username already exists")
     
     def on_destroy(self):
-        # Clean up any resources if needed
+        self.db_worker.shutdown()
         self.root.destroy()
 
     def show_forgot_password(self):
@@ -569,403 +536,6 @@ class Professor:
         self.Picture = Picture if Picture else "N/A"
 
 
-class ProfessorDirectory:
-    def __init__(self, root):
-        self.root = root
-        self.setup_ui()
-        
-    def setup_ui(self):
-        # Create main frame
-        self.main_frame = tk.Frame(self.root, bg=self.colors['background'])
-        self.main_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
-        
-        # Create header
-        self.create_header()
-        
-        # Create search bar
-        self.create_search_bar()
-        
-        # Create tree view
-        self.setup_tree()
-        
-        # Initialize professors data
-        self.professors = []
-        self.load_professors_from_file()
-
-    def setup_tree(self):
-        # Create tree view frame
-        tree_frame = tk.Frame(self.main_frame, bg=self.colors['white'])
-        tree_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-        
-        # Create Treeview
-        columns = ("Name", "Department", "Contact", "Email")
-        self.prof_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15)
-        
-        # Configure column widths and headings
-        widths = [200, 200, 150, 250]
-        for col, width in zip(columns, widths):
-            self.prof_tree.column(col, width=width, minwidth=width)
-            self.prof_tree.heading(col, text=col)
-        
-        # Style configuration for headers
-        style = ttk.Style()
-        style.configure("Treeview.Heading",
-                       background=self.colors['primary'],
-                       foreground=self.colors['white'],
-                       font=('Arial', 12, 'bold'))
-        
-        # Add scrollbars
-        y_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.prof_tree.yview)
-        x_scrollbar = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.prof_tree.xview)
-        self.prof_tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
-        
-        # Pack everything
-        self.prof_tree.pack(side="left", fill="both", expand=True)
-        y_scrollbar.pack(side="right", fill="y")
-        x_scrollbar.pack(side="bottom", fill="x")
-        
-    def create_header(self):
-        header_frame = tk.Frame(self.main_frame, bg=self.colors['background'])
-        header_frame.pack(fill=tk.X, pady=(0, 20))
-        
-        title = tk.Label(header_frame,
-                text="List of Professors",
-                font=('Arial', 24, 'bold'),
-                bg=self.colors['background'],
-                fg=self.colors['primary']).pack(side=tk.LEFT)
-        
-    def create_search_bar(self):
-        search_frame = tk.Frame(self.main_frame, bg=self.colors['background'])
-        search_frame.pack(fill=tk.X, pady=(0, 20))
-        
-        self.search_var = tk.StringVar()
-        search_entry = tk.Entry(search_frame,
-                              textvariable=self.search_var,
-                              font=('Arial', 12),
-                              bg=self.colors['white'],
-                              fg=self.colors['text'],
-                              relief=tk.FLAT,
-                              highlightthickness=1,
-                              highlightbackground=self.colors['border'])
-        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=8)
-        
-        search_button = tk.Button(search_frame,
-                                text="Search",
-                                font=('Arial', 12),
-                                bg=self.colors['primary'],
-                                fg=self.colors['white'],
-                                activebackground=self.colors['secondary'],
-                                activeforeground=self.colors['white'],
-                                cursor='hand2',
-                                relief=tk.FLAT,
-                                command=self.search_professors)
-        search_button.pack(side=tk.RIGHT, padx=(10, 0), ipadx=20, ipady=8)
-        
-    def create_logout_button(self):
-        self.logout_button = tk.Button(self.main_frame,
-                                     text="LOGOUT",
-                                     font=('Arial', 12),
-                                     bg=self.colors['primary'],
-                                     fg=self.colors['white'],
-                                     command=self.logout)
-        self.logout_button.pack(pady=(20, 0), ipadx=30, ipady=8)
-        
-    def display_professors(self, professors=None):
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-            
-        if professors is None:
-            professors = self.professors
-            
-        for professor in professors:
-            # Create frame for each professor
-            professor_frame = tk.Frame(self.list_frame, bg=self.colors['white'], cursor='hand2')
-            professor_frame.pack(fill=tk.X, pady=10, padx=20)
-            
-            # Add picture frame
-            picture_frame = tk.Frame(professor_frame, bg=self.colors['white'])
-            picture_frame.pack(side=tk.LEFT, padx=(10, 20))
-            
-            # Load and display picture
-            try:
-                if professor.Picture and professor.Picture != "N/A":
-                    image = Image.open(professor.Picture)
-                    image = image.resize((100, 100), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(image)
-                    photo_label = tk.Label(picture_frame, image=photo, bg=self.colors['white'])
-                    photo_label.image = photo  # Keep a reference!
-                else:
-                    # Create a default image with initials if no picture
-                    na_image = Image.new('RGB', (100, 100), color='lightgray')
-                    self.default_photo = ImageTk.PhotoImage(na_image)
-                    photo_label = tk.Label(picture_frame, image=self.default_photo, bg=self.colors['white'])
-                    photo_label.image = self.default_photo
-            except Exception as e:
-                # If there's any error loading the image, use default
-                na_image = Image.new('RGB', (100, 100), color='lightgray')
-                self.default_photo = ImageTk.PhotoImage(na_image)
-                photo_label = tk.Label(picture_frame, image=self.default_photo, bg=self.colors['white'])
-                photo_label.image = self.default_photo
-            
-            photo_label.pack()
-            
-            # Add name label
-            name_label = tk.Label(professor_frame,
-                                text=professor.Name,
-                                font=('Arial', 14, 'bold'),
-                                bg=self.colors['white'],
-                                fg=self.colors['text'])
-            name_label.pack(side=tk.LEFT, pady=10)
-            
-            # Bind click event to show profile
-            def bind_double_click(widget, professor):
-                widget.bind('<Double-1>', lambda e, p=professor: self._show_profile(p))
-                for child in widget.winfo_children():
-                    if isinstance(child, (tk.Frame, tk.Label)):
-                        child.bind('<Double-1>', lambda e, p=professor: self._show_profile(p))
-                        if isinstance(child, tk.Frame):
-                            for subchild in child.winfo_children():
-                                subchild.bind('<Double-1>', lambda e, p=professor: self._show_profile(p))
-            
-            professor_frame.bind('<Enter>', lambda e, frame=professor_frame: frame.configure(bg='#f5f5f5'))
-            professor_frame.bind('<Leave>', lambda e, frame=professor_frame: frame.configure(bg=self.colors['white']))
-            bind_double_click(professor_frame, professor)
-        
-    def _mask_contact(self, contact):
-        # Return actual contact number
-        return contact
-
-    def _mask_email(self, email):
-        # Return actual email
-        return email
-        
-    def _show_profile(self, professor):
-        # Create profile window
-        profile_window = tk.Toplevel(self.root)
-        profile_window.title(f"Professor Profile - {professor.Name}")
-        profile_window.geometry("1000x700")  # Made window larger
-        profile_window.configure(bg=self.colors['background'])
-        
-        # Create main content frame
-        content_frame = tk.Frame(profile_window, bg=self.colors['white'],
-                               highlightthickness=1,
-                               highlightbackground=self.colors['border'])
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
-        
-        # Top section - Basic Info with Picture
-        top_frame = tk.Frame(content_frame, bg=self.colors['white'])
-        top_frame.pack(fill=tk.X, padx=20, pady=20)
-        
-        # Picture on the left
-        picture_frame = tk.Frame(top_frame, bg=self.colors['white'])
-        picture_frame.pack(side=tk.LEFT, padx=(0, 30))
-        
-        if professor.Picture == "N/A":
-            na_image = Image.new('RGB', (100, 100), color='lightgray')
-            self.default_photo = ImageTk.PhotoImage(na_image)
-            photo_label = tk.Label(picture_frame, image=self.default_photo, bg=self.colors['white'])
-            photo_label.image = self.default_photo
-        else:
-            try:
-                img = Image.open(professor.Picture)
-                img = img.resize((100, 100), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                photo_label = tk.Label(picture_frame, image=photo, bg=self.colors['white'])
-                photo_label.image = photo
-            except:
-                na_image = Image.new('RGB', (100, 100), color='lightgray')
-                self.default_photo = ImageTk.PhotoImage(na_image)
-                photo_label = tk.Label(picture_frame, image=self.default_photo, bg=self.colors['white'])
-                photo_label.image = self.default_photo
-        photo_label.pack()
-        
-        # Information on the right
-        info_frame = tk.Frame(top_frame, bg=self.colors['white'])
-        info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Name and Department
-        tk.Label(info_frame,
-                text=professor.Name,
-                font=('Arial', 24, 'bold'),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(anchor='w')
-        
-        tk.Label(info_frame,
-                text=professor.Department,
-                font=('Arial', 16),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(anchor='w', pady=(5, 20))
-        
-        # Contact and Email
-        contact_frame = tk.Frame(info_frame, bg=self.colors['white'])
-        contact_frame.pack(fill=tk.X, pady=5)
-        
-        tk.Label(contact_frame,
-                text="Contact: ",
-                font=('Arial', 12, 'bold'),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(side=tk.LEFT)
-        
-        tk.Label(contact_frame,
-                text=self._mask_contact(professor.Contact),
-                font=('Arial', 12),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(side=tk.LEFT)
-        
-        email_frame = tk.Frame(info_frame, bg=self.colors['white'])
-        email_frame.pack(fill=tk.X, pady=5)
-        
-        tk.Label(email_frame,
-                text="Email: ",
-                font=('Arial', 12, 'bold'),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(side=tk.LEFT)
-        
-        tk.Label(email_frame,
-                text=self._mask_email(professor.Email),
-                font=('Arial', 12),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(side=tk.LEFT)
-        
-        # Separator
-        ttk.Separator(content_frame, orient='horizontal').pack(fill=tk.X, padx=20, pady=20)
-        
-        # Schedule section with border
-        schedule_frame = tk.Frame(content_frame, bg=self.colors['white'], bd=1, relief=tk.SOLID)
-        schedule_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(20,0))
-        
-        # Schedule header
-        tk.Label(schedule_frame,
-                text="Class Schedule",
-                font=('Arial', 18, 'bold'),
-                bg=self.colors['white'],
-                fg=self.colors['text']).pack(anchor='w', pady=(10, 20), padx=10)
-        
-        # Create Treeview for schedule
-        columns = ("Subject", "Day", "Time")
-        tree = ttk.Treeview(schedule_frame, columns=columns, show='headings', height=10)
-        
-        # Configure column widths and headings
-        widths = [400, 200, 200]
-        for col, width in zip(columns, widths):
-            tree.column(col, width=width, minwidth=width)
-            tree.heading(col, text=col)
-        
-        # Style configuration for headers
-        style = ttk.Style()
-        style.configure("Treeview.Heading",
-                       background=self.colors['primary'],
-                       foreground=self.colors['white'],
-                       font=('Arial', 12, 'bold'))
-        
-        # Add vertical scrollbar
-        scrollbar = ttk.Scrollbar(schedule_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack the treeview and scrollbar
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0), pady=(0, 10))
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=(0, 10))
-        
-        # Insert schedule data
-        if professor.Schedule:
-            for schedule in professor.Schedule:
-                tree.insert('', tk.END, values=(
-                    schedule['subject'],
-                    schedule['day'],
-                    schedule['time']
-                ))
-        else:
-            tree.insert('', tk.END, values=('No schedules available', '', ''))
-        
-        # Close button at bottom
-        close_btn = tk.Button(profile_window,
-                            text="Close",
-                            font=('Arial', 12),
-                            bg=self.colors['primary'],
-                            fg=self.colors['white'],
-                            activebackground='#990000',  # Darker red
-                            activeforeground=self.colors['white'],
-                            cursor='hand2',
-                            relief=tk.FLAT,
-                            command=profile_window.destroy)
-        close_btn.pack(pady=20, ipadx=30, ipady=8)
-        
-        # Add hover effect to close button
-        close_btn.bind('<Enter>', lambda e: close_btn.config(bg='#990000'))  # Darker red
-        close_btn.bind('<Leave>', lambda e: close_btn.config(bg=self.colors['primary']))
-        
-    def search_professors(self):
-        query = self.search_var.get().lower()
-        results = [professor for professor in self.professors if query in professor.Name.lower() or query in professor.Department.lower() or query in professor.Contact.lower() or query in professor.Email.lower()]
-        self.display_professors(results)
-        
-    def logout(self):
-        self.main_frame.destroy()
-        LoginWindow(self.root)
-
-    def delete_professor(self):
-        selected = self.prof_tree.selection()
-        if not selected:
-            messagebox.showerror("Error", "Please select a professor to delete")
-            return
-            
-        if not messagebox.askyesno("Confirm", "Are you sure you want to delete this professor?"):
-            return
-            
-        professor_to_remove = self.prof_tree.item(selected[0])['values'][0]
-        
-        try:
-            # Connect to database
-            conn = sqlite3.connect('profbook.db')
-            cursor = conn.cursor()
-            
-            # Get professor ID
-            cursor.execute('SELECT id FROM professors WHERE name = ?', (professor_to_remove,))
-            prof_id = cursor.fetchone()
-            
-            if prof_id:
-                # Delete schedules first (due to foreign key constraint)
-                cursor.execute('DELETE FROM schedules WHERE professor_id = ?', (prof_id[0],))
-                # Then delete the professor
-                cursor.execute('DELETE FROM professors WHERE id = ?', (prof_id[0],))
-                conn.commit()
-                
-                # Update the tree view
-                self.prof_tree.delete(selected[0])
-                messagebox.showinfo("Success", "Professor deleted successfully")
-            else:
-                messagebox.showerror("Error", "Professor not found in database")
-                
-        except sqlite3.Error as e:
-            messagebox.showerror("Database Error", f"An error occurred: {str(e)}")
-        finally:
-            conn.close()
-
-    def load_professors_from_file(self):
-        try:
-            # Get professors from database
-            professors = get_all_professors()
-            
-            # Clear existing items in tree
-            for item in self.prof_tree.get_children():
-                self.prof_tree.delete(item)
-            
-            # Add to tree view
-            for prof in professors:
-                try:
-                    values = (
-                        prof['name'],
-                        prof['department'],  # Changed from 'title' to 'department'
-                        prof['contact'],
-                        prof['email']
-                    )
-                    self.prof_tree.insert("", "end", values=values)
-                except Exception as e:
-                    print(f"Error loading professor: {str(e)}")
-                    continue
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load professors: {str(e)}")
-
 class WelcomeWindow:
     def __init__(self, root):
         self.root = root
@@ -1152,7 +722,7 @@ Get started by clicking the button below."""
         self.root.withdraw()  # Hide welcome window
         
         def on_login_close():
-            login_window.destroy()
+            login_app.on_destroy()
             self.root.deiconify()  # Show welcome window again
             
         login_window.protocol("WM_DELETE_WINDOW", on_login_close)
@@ -1190,6 +760,7 @@ class AdminDashboard:
     def __init__(self, root, username):
         self.root = root
         self.username = username
+        self.db_worker = DbWorker(root)
         self.setup_styles()
         self.setup_ui()
         
@@ -1344,9 +915,9 @@ class AdminDashboard:
     def edit_schedule_wrapper(self):
         """Wrapper function to handle professor selection before editing schedule"""
         try:
-            selected_item = self.prof_tree.selection()[0]
-            prof_name = self.prof_tree.item(selected_item)['values'][0]
-            self.edit_professor_schedule(prof_name)
+            # Tree items are keyed by professor id
+            professor_id = int(self.prof_tree.selection()[0])
+            self.edit_professor_schedule(professor_id)
         except IndexError:
             messagebox.showerror("Error", "Please select a professor first")
         
@@ -1382,9 +953,11 @@ class AdminDashboard:
         self.prof_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', 
                                           style="Custom.Treeview", height=15)
         
-        # Configure columns
-        self.prof_tree.heading('Name', text='Name')
-        self.prof_tree.heading('Department', text='Department')
+        # Configure columns; Name and Department headings change the sort
+        self.prof_tree.heading('Name', text='Name',
+                               command=lambda: self.prof_loader.reload(sort='name'))
+        self.prof_tree.heading('Department', text='Department',
+                               command=lambda: self.prof_loader.reload(sort='department'))
         self.prof_tree.heading('Contact', text='Contact')
         self.prof_tree.heading('Email', text='Email')
         
@@ -1394,9 +967,11 @@ class AdminDashboard:
         self.prof_tree.column('Contact', width=150)
         self.prof_tree.column('Email', width=250)
         
-        # Add scrollbar
+        # Add scrollbar; rows are fetched a page at a time as it moves
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.prof_tree.yview)
-        self.prof_tree.configure(yscrollcommand=scrollbar.set)
+        self.prof_loader = PagedTreeLoader(self.db_worker, self.prof_tree, scrollbar,
+                                           'professors', get_professors_page,
+                                           _professor_tree_values, sort='name')
         
         # Pack tree and scrollbar
         self.prof_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -1608,21 +1183,19 @@ class AdminDashboard:
                 messagebox.showerror("Error", "Please select a professor to delete")
                 return
                 
-            # Get professor details
-            item = self.prof_tree.item(selected[0])
-            if not item or not item['values']:
-                messagebox.showerror("Error", "Invalid selection")
+            # Several rows selected: remove them all in one statement
+            if len(selected) > 1:
+                self.delete_selected_professors(selected)
                 return
                 
-            prof_name = item['values'][0]  # Name is the first column
-            
-            # Additional validation for the professor name
-            if not prof_name or len(prof_name.strip()) == 0:
-                messagebox.showerror("Error", "Invalid professor name")
+            # Get professor details; the item id is the professor id
+            selection_id = selected[0]
+            professor = get_professor_by_id(int(selection_id))
+            if not professor:
+                messagebox.showerror("Error", "Invalid selection")
                 return
                 
-            # Store the selection ID for later use
-            selection_id = selected[0]
+            prof_name = professor.name
                 
             # Confirm deletion with more detailed message
             if not messagebox.askyesno("Confirm Delete", 
@@ -1634,7 +1207,7 @@ class AdminDashboard:
                 return
                 
             # Attempt to delete the professor
-            if delete_professor(prof_name.strip()):
+            if delete_professor_by_id(professor.id):
                 # First remove from tree view
                 try:
                     if selection_id in self.prof_tree.get_children():
@@ -1659,7 +1232,28 @@ class AdminDashboard:
             # Refresh the list to ensure consistency
             self.load_professors()
     
-    def edit_professor_schedule(self, prof_name):
+    def delete_selected_professors(self, selected):
+        """Delete every selected professor and their schedules at once"""
+        if not messagebox.askyesno("Confirm Delete",
+            f"Are you sure you want to delete {len(selected)} professors?\n\n"
+            "All of their schedules will be deleted too.\n\n"
+            "This action cannot be undone."):
+            return
+            
+        deleted = delete_professors([int(item) for item in selected])
+        if deleted:
+            messagebox.showinfo("Success", f"Deleted {deleted} professors")
+        else:
+            messagebox.showerror("Error", "Failed to delete the selected professors")
+        self.load_professors()
+        
+    def edit_professor_schedule(self, professor_id):
+        professor = get_professor_by_id(professor_id)
+        if not professor:
+            messagebox.showerror("Error", "Professor not found in database")
+            return
+        prof_name = professor.name
+        
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Edit Schedule - {prof_name}")
         dialog.geometry("800x600")
@@ -1725,17 +1319,20 @@ class AdminDashboard:
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0), pady=10)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
         
-        # Load existing schedules
-        schedules = []
-        cursor = get_db_connection().cursor()
-        cursor.execute('SELECT id FROM professors WHERE name = ?', (prof_name,))
-        prof_row = cursor.fetchone()
-        if prof_row:
-            schedules = get_professor_schedule(prof_row['id'])
+        # Load existing schedules. Each tree item's slot is kept as stored,
+        # so saving does not have to parse the display strings back
+        slots = {}
+        schedules = get_professor_schedule(professor_id)
         if schedules:
             for schedule in schedules:
-                time_slot = f"{schedule['start_time']} - {schedule['end_time']}"
-                tree.insert('', tk.END, values=(schedule['day'], time_slot, schedule.get('subject', 'N/A')))
+                time_slot = f"{schedule.start_time} - {schedule.end_time}"
+                item = tree.insert('', tk.END, values=(schedule.day, time_slot, schedule.subject or 'N/A'))
+                slots[item] = {
+                    'day': schedule.day,
+                    'start_time': schedule.start_time,
+                    'end_time': schedule.end_time,
+                    'subject': schedule.subject or 'N/A'
+                }
         
         # Add Schedule Frame
         add_frame = tk.Frame(main_frame, bg=self.colors['white'])
@@ -1791,47 +1388,19 @@ class AdminDashboard:
                 return
                 
             try:
-                if '-' not in time_str:
-                    raise ValueError("Time must contain a hyphen (-) to separate start and end times")
-                    
-                start_time, end_time = time_str.split('-')
-                start_time = start_time.strip()
-                end_time = end_time.strip()
+                # Same parser the database uses to fill the numeric time columns
+                start_time, end_time, _, _ = parse_time_range(time_str)
                 
-                for t in [start_time, end_time]:
-                    if 'AM' not in t.upper() and 'PM' not in t.upper():
-                        raise ValueError("Times must include AM or PM")
-                    if ':' not in t:
-                        raise ValueError("Times must be in HH:MM format")
-                    
-                    try:
-                        time_parts = t.replace('AM', ' AM').replace('PM', ' PM').strip().split(':')
-                        if len(time_parts) != 2:
-                            raise ValueError
-                        hour = int(time_parts[0])
-                        minute = int(time_parts[1].split()[0])
-                        period = time_parts[1].split()[1].upper()
-                        
-                        if hour < 1 or hour > 12 or minute < 0 or minute > 59:
-                            raise ValueError
-                        if period not in ['AM', 'PM']:
-                            raise ValueError
-                    except:
-                        raise ValueError(f"Invalid time format: {t}")
-                
-                # Get professor ID
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM professors WHERE name = ?', (prof_name,))
-                prof_row = cursor.fetchone()
-                
-                if not prof_row:
-                    raise ValueError(f"Professor {prof_name} not found")
+                # Refuse double-booking before touching the database
+                if find_schedule_conflicts(professor_id, day, start_time, end_time):
+                    raise ValueError(f"{day} {time_str} overlaps another class for {prof_name}")
                 
                 # Add schedule to database
-                if db_add_schedule(prof_row['id'], day, start_time, end_time, subject):
+                if db_add_schedule(professor_id, day, start_time, end_time, subject):
                     # If successful, add to treeview
-                    tree.insert('', tk.END, values=(day, time_str, subject))
+                    item = tree.insert('', tk.END, values=(day, time_str, subject))
+                    slots[item] = {'day': day, 'start_time': start_time,
+                                   'end_time': end_time, 'subject': subject}
                     
                     # Clear inputs
                     time_entry.delete(0, tk.END)
@@ -1853,27 +1422,18 @@ class AdminDashboard:
             if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected schedule(s)?"):
                 for item in selected:
                     tree.delete(item)
+                    slots.pop(item, None)
         
         def save_schedules():
             try:
-                schedules = []
-                for item in tree.get_children():
-                    values = tree.item(item)['values']
-                    time_str = values[1]
-                    start_time, end_time = map(str.strip, time_str.split('-'))
-                    
-                    schedules.append({
-                        'day': values[0],
-                        'start_time': start_time,
-                        'end_time': end_time,
-                        'subject': values[2]
-                    })
+                # Only the classes that changed are written
+                schedules = [slots[item] for item in tree.get_children()]
                 
-                if update_professor_schedule(prof_name, schedules):
+                if update_professor_schedule_by_id(professor_id, schedules):
                     messagebox.showinfo("Success", "Schedules updated successfully!")
                     dialog.destroy()
                 else:
-                    messagebox.showerror("Error", "Failed to update schedules")
+                    messagebox.showerror("Error", "Failed to update schedules. Check that no two classes overlap.")
             except Exception as e:
                 messagebox.showerror("Error", f"An error occurred while saving schedules: {str(e)}")
         
@@ -1927,8 +1487,11 @@ class AdminDashboard:
             messagebox.showerror("Error", "Please select a professor first")
             return
         
-        item = selected[0]
-        values = self.prof_tree.item(item)['values']
+        # Read the record rather than the row's display values
+        prof_data = get_professor_by_id(int(selected[0]))
+        if not prof_data:
+            messagebox.showerror("Error", "Professor not found in database")
+            return
         
         # Create dialog
         dialog = tk.Toplevel(self.root)
@@ -1947,8 +1510,7 @@ class AdminDashboard:
         profile_frame.pack(pady=(0, 15))
         
         # Get professor's current picture
-        prof_data = get_professor_by_name(values[0])
-        current_picture = prof_data.get('picture') if prof_data and prof_data.get('picture') != "N/A" else self.default_picture
+        current_picture = prof_data.picture if prof_data.picture and prof_data.picture != "N/A" else self.default_picture
         
         # Create profile picture label
         profile_label = tk.Label(profile_frame, bg=self.colors['white'])
@@ -1972,7 +1534,7 @@ class AdminDashboard:
         change_pic_btn = tk.Button(
             profile_frame,
             text="Change Picture",
-            command=lambda: self.change_profile_picture(profile_label, values[0]),
+            command=lambda: self.change_profile_picture(profile_label, prof_data.id),
             bg=self.colors['primary'],
             fg=self.colors['white'],
             font=('Arial', 10),
@@ -1994,7 +1556,7 @@ class AdminDashboard:
         ).pack(anchor='w')
         
         name_entry = tk.Entry(main_frame, font=('Arial', 11))
-        name_entry.insert(0, values[0])
+        name_entry.insert(0, prof_data.name or '')
         name_entry.pack(fill=tk.X, pady=(0, 15))
         fields['name'] = name_entry
         
@@ -2006,7 +1568,7 @@ class AdminDashboard:
         ).pack(anchor='w')
         
         dept_entry = tk.Entry(main_frame, font=('Arial', 11))
-        dept_entry.insert(0, values[1])
+        dept_entry.insert(0, prof_data.department or '')
         dept_entry.pack(fill=tk.X, pady=(0, 15))
         fields['department'] = dept_entry
         
@@ -2018,7 +1580,7 @@ class AdminDashboard:
         ).pack(anchor='w')
         
         contact_entry = tk.Entry(main_frame, font=('Arial', 11))
-        contact_entry.insert(0, values[2])
+        contact_entry.insert(0, prof_data.contact or '')
         contact_entry.pack(fill=tk.X, pady=(0, 15))
         fields['contact'] = contact_entry
         
@@ -2030,7 +1592,7 @@ class AdminDashboard:
         ).pack(anchor='w')
         
         email_entry = tk.Entry(main_frame, font=('Arial', 11))
-        email_entry.insert(0, values[3])
+        email_entry.insert(0, prof_data.email or '')
         email_entry.pack(fill=tk.X, pady=(0, 15))
         fields['email'] = email_entry
         
@@ -2052,11 +1614,11 @@ class AdminDashboard:
             font=('Arial', 11),
             bg=self.colors['primary'],  
             fg=self.colors['white'],
-            command=lambda: self.update_professor(values[0], fields, dialog)
+            command=lambda: self.update_professor(prof_data.id, fields, dialog)
         )
         save_btn.pack(side=tk.RIGHT, padx=5)
         
-    def change_profile_picture(self, profile_label, prof_name):
+    def change_profile_picture(self, profile_label, professor_id):
         file_types = [('Image files', '*.png *.jpg *.jpeg *.gif *.bmp')]
         file_path = filedialog.askopenfilename(filetypes=file_types)
         
@@ -2071,10 +1633,11 @@ class AdminDashboard:
             os.makedirs('profile_pics', exist_ok=True)
             
             # Get professor data first to validate
-            prof_data = get_professor_by_name(prof_name)
+            prof_data = get_professor_by_id(professor_id)
             if not prof_data:
                 messagebox.showerror("Error", "Professor not found in database")
                 return
+            prof_name = prof_data.name
             
             # Generate unique filename with timestamp to prevent caching
             file_ext = os.path.splitext(file_path)[1].lower()
@@ -2096,7 +1659,7 @@ class AdminDashboard:
             temp_file = None  # Don't delete the temp file since we moved it
             
             # Update database with new picture path
-            if update_professor_picture(prof_name, new_filename):
+            if update_professor_picture_by_id(professor_id, new_filename):
                 # Update display only after successful database update
                 try:
                     with Image.open(new_filename) as img:
@@ -2125,14 +1688,17 @@ class AdminDashboard:
                     pass
             messagebox.showerror("Error", f"Failed to update profile picture: {str(e)}")
         
-    def update_professor(self, old_name, fields, dialog):
+    def update_professor(self, professor_id, fields, dialog):
         values = {field: entry.get().strip() for field, entry in fields.items()}
         if not all(values.values()):
             messagebox.showerror("Error", "All fields are required")
             return
             
         try:
-            update_professor(old_name, values['name'], values['department'], values['contact'], values['email'])
+            if not update_professor_by_id(professor_id, values['name'], values['department'],
+                                          values['contact'], values['email']):
+                messagebox.showerror("Error", f"Could not update professor. The name {values['name']} may already be taken.")
+                return
             dialog.destroy()
             self.load_professors()
             messagebox.showinfo("Success", "Professor updated successfully")
@@ -2141,17 +1707,14 @@ class AdminDashboard:
 
     def logout(self):
         """Handle logout action"""
-        try:
-            # Remove remembered login file if it exists
-            if os.path.exists('remembered_login.txt'):
-                os.remove('remembered_login.txt')
-        except Exception as e:
-            print(f"Failed to remove remembered login during logout: {str(e)}")
+        # Logging out ends the remembered session, if any
+        forget_remembered_login()
             
         # Cancel any pending animations or after callbacks
         for widget in self.root.winfo_children():
             if hasattr(widget, '_after_id'):
                 self.root.after_cancel(widget._after_id)
+        self.db_worker.shutdown()
         
         # Destroy the current window
         self.root.destroy()
@@ -2181,31 +1744,12 @@ class AdminDashboard:
         button.bind('<Leave>', on_leave)
         
     def load_professors(self):
-        try:
-            # Clear existing items
-            for item in self.prof_tree.get_children():
-                self.prof_tree.delete(item)
-                
-            professors = get_all_professors()
-            print(f"[DEBUG] Loading {len(professors)} professors")
-            
-            for prof in professors:
-                try:
-                    values = (
-                        prof.get('name', 'N/A'),
-                        prof.get('department', 'N/A'),
-                        prof.get('contact', 'N/A'),
-                        prof.get('email', 'N/A')
-                    )
-                    self.prof_tree.insert("", "end", values=values)
-                    print(f"[DEBUG] Added professor: {values[0]}")
-                except Exception as e:
-                    print(f"[DEBUG] Error loading professor: {str(e)}")
-                    continue
-                    
-        except Exception as e:
-            print(f"[DEBUG] Failed to load professors: {str(e)}")
-            messagebox.showerror("Error", "Failed to load professors")
+        """Reload the professors tree without blocking the window
+        
+        As many rows as are already shown are re-read, so the tree keeps
+        its length and scroll position after an edit.
+        """
+        self.prof_loader.reload(keep_loaded=True)
     
     def setup_users_ui(self):
         """Setup the users management interface"""
@@ -2285,9 +1829,11 @@ class AdminDashboard:
                                      style="Users.Treeview", height=15)
         
         # Configure columns
-        self.users_tree.heading('Username', text='Username')
+        self.users_tree.heading('Username', text='Username',
+                                command=lambda: self.users_loader.reload(sort='username'))
         self.users_tree.heading('Email', text='Email')
-        self.users_tree.heading('Role', text='Role')
+        self.users_tree.heading('Role', text='Role',
+                                command=lambda: self.users_loader.reload(sort='role'))
         
         self.users_tree.column('Username', width=200)
         self.users_tree.column('Email', width=300)
@@ -2295,7 +1841,10 @@ class AdminDashboard:
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.users_tree.yview)
-        self.users_tree.configure(yscrollcommand=scrollbar.set)
+        self.users_loader = PagedTreeLoader(self.db_worker, self.users_tree, scrollbar,
+                                            'users', get_users_page,
+                                            _user_tree_values, sort='username',
+                                            change_marker=get_change_marker)
         
         # Pack Treeview and scrollbar
         self.users_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -2308,32 +1857,22 @@ class AdminDashboard:
         self.auto_refresh_users()
         
     def auto_refresh_users(self):
-        """Auto refresh users list every 5 seconds"""
-        self.load_users()
+        """Auto refresh users list every 5 seconds
+        
+        Each tick is one PRAGMA unless something was written since the
+        last one, so the cost no longer grows with how far the list has
+        been scrolled.
+        """
+        self.users_loader.refresh()
         self.root.after(5000, self.auto_refresh_users)
         
     def load_users(self):
-        """Load users into the treeview"""
-        print("[DEBUG] Loading users into treeview")
-        # Clear existing items
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-            
-        try:
-            users = get_all_users()
-            print(f"[DEBUG] Got {len(users)} users from database")
-            for user in users:
-                values = (
-                    user['username'],
-                    user.get('email', 'N/A'),  # Use get() to handle missing email
-                    user['role']
-                )
-                self.users_tree.insert('', tk.END, values=values)
-                print(f"[DEBUG] Added user to treeview: {values}")
-                
-        except Exception as e:
-            print(f"[DEBUG] Error loading users: {str(e)}")
-            messagebox.showerror("Error", "Failed to load users")
+        """Load users into the treeview without blocking the window
+        
+        A reload that starts while the previous one is still running
+        replaces it. Only the pages already scrolled into view are re-read.
+        """
+        self.users_loader.reload(keep_loaded=True)
             
     def add_user_dialog(self):
         """Show dialog to add a new user"""
@@ -2450,17 +1989,22 @@ class AdminDashboard:
             messagebox.showerror("Error", "Password must be at least 6 characters long")
             return
             
-        try:
-            # Add user to database
-            if add_user(username, password, role):
-                messagebox.showinfo("Success", "User added successfully")
-                dialog.destroy()
-                # Refresh users list
-                self.load_users()
-            else:
-                messagebox.showerror("Error", "Failed to add user. The username may already exist.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while adding user: {str(e)}")
+        # Add user to database; the dialog has no email field, and hashing
+        # runs on a worker so the dashboard keeps redrawing
+        self.db_worker.submit(
+            'add_user', add_user, username, password, '', role,
+            on_success=lambda added: self._finish_add_user(added, dialog),
+            on_error=lambda e: messagebox.showerror("Error", f"An error occurred while adding user: {str(e)}")
+        )
+        
+    def _finish_add_user(self, added, dialog):
+        if added:
+            messagebox.showinfo("Success", "User added successfully")
+            dialog.destroy()
+            # Refresh users list
+            self.load_users()
+        else:
+            messagebox.showerror("Error", "Failed to add user. The username may already exist.")
             
     def delete_user(self):
         """Delete selected user"""
@@ -2477,7 +2021,13 @@ class AdminDashboard:
                 messagebox.showerror("Error", "Invalid selection")
                 return
                 
-            username = item['values'][0]
+            # The item id is the user id; Tk turns a username like '007'
+            # into 7, so compare the stored record rather than the cell
+            user = get_user_by_id(int(selected[0]))
+            if user is None:
+                messagebox.showerror("Error", "User not found")
+                return
+            username = user.username
             
             # Prevent deleting yourself
             if username == self.username:
@@ -2491,7 +2041,7 @@ class AdminDashboard:
                 return
                 
             # Delete user
-            if delete_user(username):
+            if delete_user_by_id(user.id):
                 messagebox.showinfo("Success", f"User {username} deleted successfully")
                 # Refresh users list
                 self.load_users()
@@ -2506,8 +2056,12 @@ class StudentPanel:
         self.root = root
         self.username = username
         
-        # Initialize storage for profile photos first
+        # Initialize storage for profile photos and directory rows first
         self.profile_photos = {}
+        self.pending_thumbnails = {}
+        self.default_photo = None
+        self.directory = {}
+        self.db_worker = DbWorker(root)
         
         # Initialize UI components
         self.setup_styles()
@@ -2607,6 +2161,18 @@ class StudentPanel:
         )
         search_entry.pack(side=tk.LEFT, padx=10)
         
+        # Only show professors who are not in class right now
+        self.available_only_var = tk.BooleanVar(value=False)
+        available_check = tk.Checkbutton(search_frame,
+            text="Available now",
+            variable=self.available_only_var,
+            font=('Arial', 11),
+            bg=self.colors['white'],
+            activebackground=self.colors['white'],
+            command=self.search_professors
+        )
+        available_check.pack(side=tk.LEFT, padx=10)
+        
         # Professors frame
         self.professors_frame = tk.Frame(main_container, bg=self.colors['white'])
         self.professors_frame.pack(fill=tk.BOTH, expand=True)
@@ -2644,30 +2210,8 @@ class StudentPanel:
         card.pack(side=tk.LEFT, padx=10, pady=10, ipadx=10, ipady=10)
         
         try:
-            # Get fresh data from database to ensure we have the latest picture
-            prof_data = get_professor_by_name(professor['name'])
-            if not prof_data:
-                raise Exception(f"Professor {professor['name']} not found in database")
-                
-            # Clear the old photo from cache if it exists
-            if professor['name'] in self.profile_photos:
-                del self.profile_photos[professor['name']]
-            
-            # Load and process image
-            image = None
             try:
-                if prof_data.get('picture') and os.path.exists(prof_data['picture']):
-                    image = Image.open(prof_data['picture'])
-                    image.load()  # Force load the image data
-                else:
-                    image = Image.open(create_default_profile_picture())
-                    
-                # Resize image
-                image.thumbnail((150, 150), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
-                
-                # Store reference to prevent garbage collection
-                self.profile_photos[professor['name']] = photo
+                photo = self._get_profile_photo(professor)
                 
                 # Profile picture label
                 profile_label = tk.Label(card, image=photo, bg=self.colors['white'])
@@ -2675,12 +2219,9 @@ class StudentPanel:
                 profile_label.pack(pady=(10, 5))
                 
             except Exception as img_error:
-                messagebox.showerror("Error", f"Failed to load image for {professor['name']}: {str(img_error)}")
+                messagebox.showerror("Error", f"Failed to load image for {professor.name}: {str(img_error)}")
                 profile_label = tk.Label(card, text="No Image", bg=self.colors['white'])
                 profile_label.pack(pady=(10, 5))
-            finally:
-                if image:
-                    image.close()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load professor data: {str(e)}")
@@ -2688,10 +2229,19 @@ class StudentPanel:
             profile_label.pack(pady=(10, 5))
         
         # Professor details
-        tk.Label(card, text=professor['name'], font=('Arial', 12, 'bold'), bg=self.colors['white']).pack()
-        tk.Label(card, text=professor['department'], font=('Arial', 10), bg=self.colors['white']).pack()
-        tk.Label(card, text=professor['contact'], font=('Arial', 10), bg=self.colors['white']).pack()
-        tk.Label(card, text=professor['email'], font=('Arial', 10), bg=self.colors['white']).pack()
+        tk.Label(card, text=professor.name, font=('Arial', 12, 'bold'), bg=self.colors['white']).pack()
+        tk.Label(card, text=professor.department, font=('Arial', 10), bg=self.colors['white']).pack()
+        tk.Label(card, text=professor.contact, font=('Arial', 10), bg=self.colors['white']).pack()
+        tk.Label(card, text=professor.email, font=('Arial', 10), bg=self.colors['white']).pack()
+        
+        # Schedule summary
+        next_class = professor.next_class
+        if next_class:
+            summary = f"Next: {next_class.day} {next_class.start_time}"
+        else:
+            summary = "No classes scheduled"
+        tk.Label(card, text=f"Classes: {professor.schedule_count}", font=('Arial', 9), bg=self.colors['white']).pack()
+        tk.Label(card, text=summary, font=('Arial', 9, 'italic'), bg=self.colors['white']).pack()
         
         # View Schedule button
         view_schedule_button = tk.Button(
@@ -2704,59 +2254,102 @@ class StudentPanel:
         )
         view_schedule_button.pack(pady=10)
 
+    def _get_profile_photo(self, professor):
+        """Get the card photo for a professor, creating it on first use"""
+        photo = self.profile_photos.get(professor.id)
+        if photo is not None:
+            return photo
+            
+        image = self.pending_thumbnails.pop(professor.id, None)
+        if image is None and professor.picture and os.path.exists(professor.picture):
+            image = load_thumbnail(professor.picture)
+        if image is None:
+            # Everyone without a picture shares one default photo
+            if self.default_photo is None:
+                default = load_thumbnail(create_default_profile_picture())
+                try:
+                    self.default_photo = ImageTk.PhotoImage(default)
+                finally:
+                    default.close()
+            return self.default_photo
+            
+        try:
+            photo = ImageTk.PhotoImage(image)
+        finally:
+            image.close()
+        # Store reference to prevent garbage collection
+        self.profile_photos[professor.id] = photo
+        return photo
+
     def load_professors(self):
-        # Clear existing professors
+        """Reload the directory in the background and redraw the cards"""
+        self.db_worker.submit(
+            'directory', _fetch_directory,
+            on_success=self._show_directory,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to refresh professors: {str(e)}")
+        )
+        
+    def _show_directory(self, result):
+        """Replace the cards with a freshly loaded directory"""
+        professors, thumbnails = result
+        self.directory = {prof.id: prof for prof in professors}
+        for image in self.pending_thumbnails.values():
+            image.close()
+        self.pending_thumbnails = thumbnails
+        self.profile_photos.clear()
+        
+        if self.search_var.get().strip() or self.available_only_var.get():
+            self.search_professors()
+        else:
+            self._show_cards(professors)
+            
+    def _show_cards(self, professors):
+        """Draw professor cards a few per frame so the window stays responsive"""
         for widget in self.professors_frame_inside.winfo_children():
             widget.destroy()
             
-        # Clear the photo cache
-        self.profile_photos.clear()
-        
-        # Reload professors
-        try:
-            professors = get_all_professors()
-            if not professors:
-                # Show message if no professors found
-                msg_label = tk.Label(
-                    self.professors_frame_inside,
-                    text="No professors found",
-                    font=('Arial', 14),
-                    bg=self.colors['white']
-                )
-                msg_label.pack(expand=True, pady=20)
-                return
-                
-            for prof in professors:
-                self.create_professor_card(prof)
-                
-            # Update the frame
-            self.professors_frame_inside.update_idletasks()
+        if not professors:
+            # Show message if no professors found
+            msg_label = tk.Label(
+                self.professors_frame_inside,
+                text="No professors found",
+                font=('Arial', 14),
+                bg=self.colors['white']
+            )
+            msg_label.pack(expand=True, pady=20)
+            return
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to refresh professors: {str(e)}")
+        self.db_worker.fill_in_batches('cards', professors, self.create_professor_card,
+                                       done=self.professors_frame_inside.update_idletasks,
+                                       batch=_CARDS_PER_FRAME)
 
     def search_professors(self):
-        search_term = self.search_var.get().lower()
+        search_term = self.search_var.get().strip()
+        
+        # Cards come from the directory loaded by load_professors; the
+        # full-text index only decides which ones match and in what order
+        self.db_worker.submit(
+            'search', _find_professor_ids, search_term, self.available_only_var.get(),
+            on_success=self._show_matches,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to search professors: {str(e)}")
+        )
         
-        # Clear existing professors
-        for widget in self.professors_frame_inside.winfo_children():
-            widget.destroy()
-            
-        try:
-            professors = get_all_professors()
-            for prof in professors:
-                if (search_term in prof['name'].lower() or
-                    search_term in prof['department'].lower() or
-                    search_term in str(prof['contact']).lower() or
-                    search_term in str(prof['email']).lower()):
-                    self.create_professor_card(prof)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to search professors: {str(e)}")
+    def _show_matches(self, result):
+        """Draw the cards for a search result from _find_professor_ids"""
+        matching_ids, available = result
+        if matching_ids is None:
+            matches = list(self.directory.values())
+        else:
+            matches = [self.directory[prof_id] for prof_id in matching_ids
+                       if prof_id in self.directory]
+        if available is not None:
+            matches = [prof for prof in matches if prof.id in available]
+        self._show_cards(matches)
     
     def view_schedule(self, professor):
         # Create a new window for the schedule
         schedule_window = tk.Toplevel(self.root)
-        schedule_window.title(f"Schedule - {professor['name']}")
+        schedule_window.title(f"Schedule - {professor.name}")
         schedule_window.geometry("600x400")
         schedule_window.configure(bg=self.colors['white'])
         
@@ -2765,13 +2358,13 @@ class StudentPanel:
         info_frame.pack(fill='x', padx=20, pady=10)
         
         # Display professor information
-        tk.Label(info_frame, text=f"Professor: {professor['name']}", 
+        tk.Label(info_frame, text=f"Professor: {professor.name}", 
                 font=('Arial', 12, 'bold'), bg=self.colors['white']).pack(anchor='w')
-        tk.Label(info_frame, text=f"Department: {professor['department']}", 
+        tk.Label(info_frame, text=f"Department: {professor.department}", 
                 font=('Arial', 10), bg=self.colors['white']).pack(anchor='w')
-        tk.Label(info_frame, text=f"Contact: {professor['contact']}", 
+        tk.Label(info_frame, text=f"Contact: {professor.contact}", 
                 font=('Arial', 10), bg=self.colors['white']).pack(anchor='w')
-        tk.Label(info_frame, text=f"Email: {professor['email']}", 
+        tk.Label(info_frame, text=f"Email: {professor.email}", 
                 font=('Arial', 10), bg=self.colors['white']).pack(anchor='w')
         
         # Create a separator
@@ -2781,32 +2374,15 @@ class StudentPanel:
         schedule_frame = tk.Frame(schedule_window, bg=self.colors['white'])
         schedule_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
-        # Get schedule from database
-        schedules = []
-        cursor = get_db_connection().cursor()
-        cursor.execute('SELECT id FROM professors WHERE name = ?', (professor['name'],))
-        prof_row = cursor.fetchone()
-        if prof_row:
-            schedules = get_professor_schedule(prof_row['id'])
+        loading_label = tk.Label(schedule_frame, text="Loading schedule...",
+                font=('Arial', 10, 'italic'), bg=self.colors['white'])
+        loading_label.pack(pady=20)
         
-        if schedules:
-            # Create headers
-            headers = ['Day', 'Time', 'Subject']
-            for i, header in enumerate(headers):
-                tk.Label(schedule_frame, text=header, font=('Arial', 10, 'bold'),
-                        bg=self.colors['white']).grid(row=0, column=i, padx=5, pady=5, sticky='w')
-            
-            # Display schedule
-            for i, entry in enumerate(schedules, start=1):
-                tk.Label(schedule_frame, text=entry['day'], bg=self.colors['white']).grid(
-                    row=i, column=0, padx=5, pady=2, sticky='w')
-                tk.Label(schedule_frame, text=entry['start_time'] + ' - ' + entry['end_time'], bg=self.colors['white']).grid(
-                    row=i, column=1, padx=5, pady=2, sticky='w')
-                tk.Label(schedule_frame, text=entry['subject'], bg=self.colors['white']).grid(
-                    row=i, column=2, padx=5, pady=2, sticky='w')
-        else:
-            tk.Label(schedule_frame, text="No schedule available", 
-                    font=('Arial', 10, 'italic'), bg=self.colors['white']).pack(pady=20)
+        # Get schedule from database without blocking the window
+        self.db_worker.submit(
+            f'schedule:{schedule_window}', get_professor_schedule, professor.id,
+            on_success=lambda schedules: self._show_schedule(schedule_frame, schedules)
+        )
         
         # Close button
         close_btn = tk.Button(schedule_window,
@@ -2825,19 +2401,40 @@ class StudentPanel:
         close_btn.bind('<Enter>', lambda e: close_btn.config(bg='#990000'))  # Darker red
         close_btn.bind('<Leave>', lambda e: close_btn.config(bg=self.colors['primary']))
         
+    def _show_schedule(self, schedule_frame, schedules):
+        """Fill a schedule window once its rows have loaded"""
+        if not schedule_frame.winfo_exists():
+            return
+        for widget in schedule_frame.winfo_children():
+            widget.destroy()
+            
+        if schedules:
+            # Create headers
+            headers = ['Day', 'Time', 'Subject']
+            for i, header in enumerate(headers):
+                tk.Label(schedule_frame, text=header, font=('Arial', 10, 'bold'),
+                        bg=self.colors['white']).grid(row=0, column=i, padx=5, pady=5, sticky='w')
+            
+            # Display schedule
+            for i, entry in enumerate(schedules, start=1):
+                tk.Label(schedule_frame, text=entry.day, bg=self.colors['white']).grid(
+                    row=i, column=0, padx=5, pady=2, sticky='w')
+                tk.Label(schedule_frame, text=entry.start_time + ' - ' + entry.end_time, bg=self.colors['white']).grid(
+                    row=i, column=1, padx=5, pady=2, sticky='w')
+                tk.Label(schedule_frame, text=entry.subject, bg=self.colors['white']).grid(
+                    row=i, column=2, padx=5, pady=2, sticky='w')
+        else:
+            tk.Label(schedule_frame, text="No schedule available", 
+                    font=('Arial', 10, 'italic'), bg=self.colors['white']).pack(pady=20)
+        
     def logout(self):
-        try:
-            # Check if remember me was unchecked
-            if not self.remember_var.get():
-                # Remove remembered login file
-                if os.path.exists('remembered_login.txt'):
-                    os.remove('remembered_login.txt')
-        except:
-            pass
+        # Logging out ends the remembered session, if any
+        forget_remembered_login()
             
         # Clean up any animation timers
         for anim_id in self.animation_ids:
             self.root.after_cancel(anim_id)
+        self.db_worker.shutdown()
         
         # Close the current window and show login
         self.root.destroy()
@@ -2845,43 +2442,12 @@ class StudentPanel:
         LoginWindow(root)
     
     def refresh_professors(self):
-        """Refresh the professor cards display"""
-        try:
-            # Clear existing professors
-            for widget in self.professors_frame_inside.winfo_children():
-                widget.destroy()
-                
-            # Clear photo references
-            for photo in self.profile_photos.values():
-                if hasattr(photo, 'close'):
-                    photo.close()
-            self.profile_photos.clear()
-            
-            # Force garbage collection to clean up old images
-            import gc
-            gc.collect()
-            
-            # Reload professors
-            professors = get_all_professors()
-            if not professors:
-                # Show message if no professors found
-                msg_label = tk.Label(
-                    self.professors_frame_inside,
-                    text="No professors found",
-                    font=('Arial', 14),
-                    bg=self.colors['white']
-                )
-                msg_label.pack(expand=True, pady=20)
-                return
-                
-            for prof in professors:
-                self.create_professor_card(prof)
-                
-            # Update the frame
-            self.professors_frame_inside.update()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to refresh professors: {str(e)}")
+        """Refresh the professor cards display
+        
+        The current cards stay up until the new directory has loaded;
+        pictures are re-read since they may have changed.
+        """
+        self.load_professors()
 
     def _on_frame_configure(self, event=None):
         """Reset the scroll region to encompass the inner frame"""
@@ -2911,6 +2477,109 @@ def refresh_all_student_panels():
                 if panel in student_panels:
                     student_panels.remove(panel)
 
+def _professor_tree_values(prof):
+    """Row values for the admin professors tree"""
+    return (
+        prof.name or 'N/A',
+        prof.department or 'N/A',
+        prof.contact or 'N/A',
+        prof.email or 'N/A'
+    )
+
+def _user_tree_values(user):
+    """Row values for the admin users tree"""
+    return (
+        user.username,
+        user.email or 'N/A',  # Handle missing email
+        user.role
+    )
+
+def load_thumbnail(path, size=(150, 150)):
+    """Open an image and shrink it to card size
+    
+    Safe to call from a worker thread; only the ImageTk.PhotoImage has to
+    be created on the Tk thread.
+    
+    Returns:
+        PIL.Image.Image: The loaded thumbnail
+    """
+    with Image.open(path) as image:
+        image.load()  # Force load the image data
+        thumbnail = image.copy()
+    thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
+    return thumbnail
+
+def _fetch_directory():
+    """Load the student directory and its pictures (runs on a worker thread)
+    
+    Returns:
+        tuple: (DirectoryRecord list, {professor_id: thumbnail}) where
+            professors without a readable picture are left out of the dict
+    """
+    professors = get_professor_directory()
+    thumbnails = {}
+    for prof in professors:
+        if prof.picture and os.path.exists(prof.picture):
+            try:
+                thumbnails[prof.id] = load_thumbnail(prof.picture)
+            except Exception as e:
+                logger.warning("Could not load picture for %s: %s", prof.name, e)
+    return professors, thumbnails
+
+def _find_professor_ids(search_term, available_only):
+    """Run a student search (runs on a worker thread)
+    
+    Returns:
+        tuple: (matching ids in rank order, or None for everyone;
+            set of available ids, or None when not filtering)
+    """
+    matching_ids = db_search_professors(search_term, limit=None) if search_term else None
+    available = set(available_professors()) if available_only else None
+    return matching_ids, available
+
+def read_remembered_token():
+    """Get the remember-me token saved by a previous login, or None"""
+    try:
+        with open(_REMEMBER_FILE, 'r') as f:
+            return f.readline().strip() or None
+    except OSError:
+        return None
+
+def remember_token(token):
+    """Save a session token so the next start logs in without a password"""
+    if not token:
+        return
+    try:
+        with open(_REMEMBER_FILE, 'w') as f:
+            f.write(token + '\n')
+    except OSError as e:
+        logger.error("Failed to save remembered login: %s", e)
+
+def renew_remembered_login(username):
+    """Issue a new remember-me token, revoking the one saved before it"""
+    token = create_session(username, replaces=read_remembered_token())
+    if token:
+        remember_token(token)
+    else:
+        forget_remembered_login()
+
+def forget_remembered_login():
+    """End the remembered session and remove its token file"""
+    token = read_remembered_token()
+    if token:
+        end_session(token)
+    try:
+        os.remove(_REMEMBER_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error("Failed to remove remembered login: %s", e)
+
+def schedule_session_purge(root, worker):
+    """Purge expired sessions now and then every _SESSION_PURGE_MS"""
+    worker.submit('purge_sessions', purge_expired_sessions)
+    root.after(_SESSION_PURGE_MS, schedule_session_purge, root, worker)
+
 def create_default_profile_picture():
     """Create a default profile picture if it doesn't exist"""
     default_pic_dir = "profile_pics"
@@ -2935,11 +2604,15 @@ def create_default_profile_picture():
     return default_pic_path
 
 def main():
+    configure_logging()
     root = tk.Tk()
     welcome = WelcomeWindow(root)
+    purge_worker = DbWorker(root, max_workers=1)
+    schedule_session_purge(root, purge_worker)
     
     # Register database cleanup on window close
     def on_closing():
+        purge_worker.shutdown()
         close_db()
         root.destroy()
     
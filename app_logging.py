@@ -0,0 +1,99 @@
+"""Logging setup shared by the UI and the database layer
+
+Messages use lazy %-style arguments, so nothing is formatted unless the
+level is enabled. The level comes from PROFBOOK_LOG_LEVEL (default
+WARNING); PROFBOOK_LOG_JSON names an optional JSON Lines log file.
+"""
+
+import functools
+import json
+import logging
+import os
+import time
+
+_LOGGER_NAME = 'profbook'
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if hasattr(record, 'duration_ms'):
+            entry['duration_ms'] = record.duration_ms
+        if hasattr(record, 'function'):
+            entry['function'] = record.function
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+def get_logger(name=None):
+    """Get the application logger or one of its children
+
+    Args:
+        name (str, optional): Child name such as 'database'
+
+    Returns:
+        logging.Logger: Logger under the 'profbook' hierarchy
+    """
+    return logging.getLogger(f'{_LOGGER_NAME}.{name}' if name else _LOGGER_NAME)
+
+def configure_logging(level=None, json_path=None):
+    """Attach console and optional JSON handlers to the application logger
+
+    Calling it again replaces the previous handlers.
+
+    Args:
+        level (str or int, optional): Log level; defaults to
+            PROFBOOK_LOG_LEVEL or WARNING
+        json_path (str, optional): JSON Lines file; defaults to
+            PROFBOOK_LOG_JSON if set
+    """
+    logger = get_logger()
+    if level is None:
+        level = os.environ.get('PROFBOOK_LOG_LEVEL', 'WARNING')
+    if json_path is None:
+        json_path = os.environ.get('PROFBOOK_LOG_JSON')
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('[%(levelname)s] %(name)s: %(message)s'))
+    logger.addHandler(console)
+
+    if json_path:
+        json_handler = logging.FileHandler(json_path, encoding='utf-8')
+        json_handler.setFormatter(JsonFormatter())
+        logger.addHandler(json_handler)
+
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+def timed(logger):
+    """Decorate a function to log its duration at DEBUG level
+
+    When DEBUG is disabled the wrapper only checks the level and calls
+    straight through, so no clock is read and nothing is formatted.
+    """
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not logger.isEnabledFor(logging.DEBUG):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                logger.debug('%s took %.3f ms', name, duration_ms,
+                             extra={'duration_ms': round(duration_ms, 3), 'function': name})
+        return wrapper
+    return decorator
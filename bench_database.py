@@ -0,0 +1,382 @@
+"""Benchmark every public function in database.py against a synthetic campus
+
+The campus is built in a temporary file, or with --memory in a shared
+in-memory database, so the real database under data/ is never touched.
+Results are written as JSON; --compare checks them against a stored
+baseline and exits with status 1 on a regression.
+
+Examples:
+    python bench_database.py --size small --output bench.json
+    python bench_database.py --size medium --compare baseline.json --tolerance 0.25
+    python bench_database.py --import-budget-ms 100
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+
+import passwords
+
+# Campus sizes: (professors, schedules, users)
+SIZES = {
+    'small': (100, 1000, 100),
+    'medium': (10000, 100000, 5000),
+    'large': (100000, 1000000, 50000)
+}
+
+_FIRST_NAMES = ['Ana', 'Ben', 'Carla', 'Dev', 'Elena', 'Farid', 'Grace', 'Hiro',
+                'Ines', 'Jon', 'Kemal', 'Lena', 'Mateo', 'Nia', 'Omar', 'Priya']
+_LAST_NAMES = ['Garcia', 'Smith', 'Tanaka', 'Okafor', 'Novak', 'Rossi', 'Kim',
+               'Haddad', 'Silva', 'Murphy', 'Weber', 'Chen', 'Dubois', 'Ivanova']
+_DEPARTMENTS = ['Computer Science', 'Mathematics', 'Physics', 'Chemistry',
+                'Biology', 'History', 'Economics', 'Philosophy', 'Engineering',
+                'Literature', 'Psychology', 'Architecture']
+_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+_BENCH_PASSWORD = 'password'
+
+# Control functions that reset state rather than do work worth timing
+_NOT_TIMED = {'close_db', 'configure', 'set_pragma_profile', 'enable_sql_trace',
+              'disable_sql_trace', 'reset_sql_stats', 'clear_cache'}
+
+def _format_time(minute):
+    """Format minutes since midnight as '9:00 AM'"""
+    hour, minute = divmod(minute, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+def _password_hash(password):
+    """Hash a password the way database.add_user stores it"""
+    return passwords.hash_password(password)
+
+def build_campus(db, professors, schedules, users):
+    """Fill an empty database with synthetic professors, schedules and users
+
+    Rows are inserted with executemany in one transaction per table. Each
+    professor's classes are one hour long on distinct weekday slots, so
+    the data has no overlapping schedules.
+
+    Returns:
+        dict: Names and ids the benchmark cases pick their arguments from
+    """
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+
+    names = [f"{_FIRST_NAMES[i % len(_FIRST_NAMES)]} "
+             f"{_LAST_NAMES[(i // len(_FIRST_NAMES)) % len(_LAST_NAMES)]} {i:06d}"
+             for i in range(professors)]
+    cursor.execute('BEGIN')
+    cursor.executemany(
+        'INSERT INTO professors (name, department, contact, email) VALUES (?, ?, ?, ?)',
+        ((name, _DEPARTMENTS[i % len(_DEPARTMENTS)], f"555-{i:07d}", f"prof{i}@campus.edu")
+         for i, name in enumerate(names))
+    )
+    conn.commit()
+    professor_ids = [row[0] for row in cursor.execute('SELECT id FROM professors ORDER BY id')]
+
+    def schedule_rows():
+        for n in range(schedules):
+            slot = n // professors
+            weekday = slot % len(_DAYS)
+            start = 8 * 60 + (slot // len(_DAYS)) * 60
+            yield (professor_ids[n % professors], _DAYS[weekday],
+                   _format_time(start), _format_time(start + 60),
+                   f"Course {n % 500}", weekday, start, start + 60)
+
+    cursor.execute('BEGIN')
+    cursor.executemany(
+        '''INSERT INTO schedules (professor_id, day, start_time, end_time, subject,
+                                  weekday, start_minute, end_minute)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+        schedule_rows()
+    )
+    conn.commit()
+    schedule_ids = [row[0] for row in cursor.execute('SELECT id FROM schedules ORDER BY id')]
+
+    hashed = _password_hash(_BENCH_PASSWORD)
+    cursor.execute('BEGIN')
+    cursor.executemany(
+        'INSERT INTO users (username, password, email, role) VALUES (?, ?, ?, ?)',
+        ((f"user{i:06d}", hashed, f"user{i}@campus.edu", 'user') for i in range(users))
+    )
+    conn.commit()
+    user_ids = [row[0] for row in cursor.execute(
+        "SELECT id FROM users WHERE username GLOB 'user[0-9]*' ORDER BY username")]
+    cursor.execute('ANALYZE')
+    db.clear_cache()
+    session_token = db.create_session(f"user{0:06d}") if users else None
+
+    return {
+        'names': names,
+        'professor_ids': professor_ids,
+        'schedule_ids': schedule_ids,
+        'usernames': [f"user{i:06d}" for i in range(users)],
+        'user_ids': user_ids,
+        'session_token': session_token
+    }
+
+def benchmark_cases(campus):
+    """Build the benchmark table: name -> (args_for_run, cold)
+
+    args_for_run(i) returns the positional arguments for repetition i,
+    so destructive cases can touch a different row each time. Cold cases
+    clear the read cache before every repetition (outside the timing).
+    Reads come first and destructive writes last.
+    """
+    names = campus['names']
+    ids = campus['professor_ids']
+    schedule_ids = campus['schedule_ids']
+    usernames = campus['usernames']
+    user_ids = campus['user_ids']
+    middle = len(names) // 2
+    quarter = len(names) // 4
+
+    def nth_from_end(items, i):
+        return items[-1 - i]
+
+    return {
+        'parse_weekday': (lambda i: ('Wed',), False),
+        'parse_time': (lambda i: ('9:30 AM',), False),
+        'parse_time_range': (lambda i: ('9:00 AM - 10:30 AM',), False),
+        'verify_user': (lambda i: (usernames[0], _BENCH_PASSWORD), False),
+        'get_all_professors': (lambda i: (), True),
+        'get_professor_by_name': (lambda i: (names[middle],), True),
+        'get_professor_by_id': (lambda i: (ids[middle],), True),
+        'get_professor_directory': (lambda i: (), True),
+        'search_professors': (lambda i: ('Gar',), True),
+        'get_professor_schedule': (lambda i: (ids[middle],), True),
+        'get_schedules_by_day': (lambda i: ('Monday',), True),
+        'get_schedules_in_range': (lambda i: ('Monday', '9:00 AM', '11:00 AM'), True),
+        'available_professors': (lambda i: (0, 9 * 60), False),
+        'next_free_slot': (lambda i: (ids[middle], (0, 8 * 60)), False),
+        'find_schedule_conflicts': (lambda i: (ids[middle], 'Monday', '8:30 AM', '9:30 AM'), False),
+        'audit_schedule_conflicts': (lambda i: (), False),
+        'get_all_users': (lambda i: (), False),
+        'get_user_by_id': (lambda i: (user_ids[0],), False),
+        'iter_professors': (lambda i: (), False),
+        'iter_users': (lambda i: (), False),
+        'iter_schedules': (lambda i: ('Monday',), False),
+        'get_professors_page': (lambda i: (None if i == 0 else (names[middle], ids[middle]), 100), False),
+        'get_users_page': (lambda i: (None if i == 0 else (usernames[len(usernames) // 2], 0), 100), False),
+        'resume_session': (lambda i: (campus['session_token'],), False),
+        'get_connection_stats': (lambda i: (), False),
+        'get_change_marker': (lambda i: (), False),
+        'get_cache_stats': (lambda i: (), False),
+        'get_sql_stats': (lambda i: (), False),
+        'get_db_diagnostics': (lambda i: (), False),
+        'add_professor': (lambda i: (f"Bench Professor {i}", 'Benchmarks', '555-0000', 'bench@campus.edu'), False),
+        'update_professor': (lambda i: (names[i], names[i], 'Benchmarks', '555-0001', f"prof{i}@campus.edu"), False),
+        'update_professor_by_id': (lambda i: (ids[i], names[i], 'Benchmarks', '555-0003', f"prof{i}@campus.edu"), False),
+        'update_professor_picture': (lambda i: (names[i], 'bench.png'), False),
+        'update_professor_picture_by_id': (lambda i: (ids[i], 'bench-id.png'), False),
+        'add_schedule': (lambda i: (ids[i], 'Saturday', '9:00 AM', '10:00 AM', 'Bench'), False),
+        'update_single_schedule': (lambda i: (schedule_ids[i], 'Sunday', '8:00 AM', '9:00 AM', 'Bench'), False),
+        'update_professor_schedule': (lambda i: (names[middle + i], [
+            {'day': day, 'start_time': '1:00 PM', 'end_time': '2:00 PM', 'subject': 'Bench'}
+            for day in _DAYS
+        ]), False),
+        'update_professor_schedule_by_id': (lambda i: (ids[middle + i], [
+            {'day': day, 'start_time': '3:00 PM', 'end_time': '4:00 PM', 'subject': 'Bench'}
+            for day in _DAYS
+        ]), False),
+        'bulk_add_professors': (lambda i: ([{'name': f"Bulk Professor {i}-{n}", 'department': 'Benchmarks',
+                                             'contact': '555-0002', 'email': 'bulk@campus.edu'}
+                                            for n in range(100)],), False),
+        'bulk_add_schedules': (lambda i: ([{'professor_id': ids[n], 'day': 'Sunday',
+                                            'start_time': _format_time(12 * 60 + i * 10),
+                                            'end_time': _format_time(12 * 60 + i * 10 + 5),
+                                            'subject': 'Bench'}
+                                           for n in range(min(100, len(ids)))],), False),
+        'add_user': (lambda i: (f"bench_user_{i}", _BENCH_PASSWORD, 'bench@campus.edu', 'user'), False),
+        'bulk_add_users': (lambda i: ([(f"bulk_user_{i}_{n}", _BENCH_PASSWORD, 'bulk@campus.edu', 'user')
+                                       for n in range(8)],), False),
+        'create_session': (lambda i: (usernames[i],), False),
+        'end_session': (lambda i: ('unknown-token',), False),
+        'purge_expired_sessions': (lambda i: (), False),
+        'delete_user': (lambda i: (nth_from_end(usernames, i),), False),
+        'delete_user_by_id': (lambda i: (user_ids[len(user_ids) // 2 + i],), False),
+        'delete_schedule': (lambda i: (nth_from_end(schedule_ids, i),), False),
+        'delete_professor': (lambda i: (nth_from_end(names, i),), False),
+        'delete_professor_by_id': (lambda i: (ids[quarter + i],), False),
+        'delete_professors': (lambda i: (ids[middle + quarter // 2 + 3 * i:middle + quarter // 2 + 3 * i + 3],), False)
+    }
+
+def run_benchmarks(db, campus, repeat):
+    """Time each case `repeat` times
+
+    Returns:
+        tuple: (results dict keyed by function name, names without a case)
+    """
+    cases = benchmark_cases(campus)
+    public = [name for name in db.__all__
+              if callable(getattr(db, name)) and not isinstance(getattr(db, name), type)]
+    missing = [name for name in public if name not in cases and name not in _NOT_TIMED]
+
+    results = {}
+    for name, (args_for_run, cold) in cases.items():
+        if name not in public:
+            continue
+        func = getattr(db, name)
+        timings = []
+        for i in range(repeat):
+            args = args_for_run(i)
+            if cold:
+                db.clear_cache()
+            start = time.perf_counter()
+            result = func(*args)
+            if name.startswith('iter_'):
+                # Generators do their work as they are consumed
+                deque(result, maxlen=0)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'median_ms': round(statistics.median(timings), 4),
+            'min_ms': round(min(timings), 4),
+            'max_ms': round(max(timings), 4),
+            'runs': repeat
+        }
+        print(f"{name:<32} {results[name]['median_ms']:>12.3f} ms")
+    return results, missing
+
+def measure_import(runs=5):
+    """Time a cold `import database` in fresh interpreters
+
+    Each run imports the module from an empty directory, so the result
+    shows what every entry point (UI, CLI, this script) pays before doing
+    any work, and whether importing alone creates files.
+
+    Returns:
+        tuple: (median milliseconds, sorted list of files the import created)
+    """
+    repo = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=repo + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    code = ('import time; start = time.perf_counter(); import database; '
+            'print((time.perf_counter() - start) * 1000)')
+    timings = []
+    created = set()
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory(prefix='profbook-import-') as empty:
+            output = subprocess.run([sys.executable, '-c', code], cwd=empty, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            timings.append(float(output.strip().splitlines()[-1]))
+            for root, dirs, files in os.walk(empty):
+                for name in dirs + files:
+                    created.add(os.path.relpath(os.path.join(root, name), empty))
+    return statistics.median(timings), sorted(created)
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Find functions whose median got slower than the baseline allows
+
+    A function regresses when its median exceeds the baseline median by
+    more than `tolerance` (a fraction) and by more than `min_delta_ms`,
+    which keeps sub-millisecond noise from failing the run.
+
+    Returns:
+        list: (name, baseline_ms, current_ms) for each regression
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        before, after = previous['median_ms'], current['median_ms']
+        if after > before * (1 + tolerance) and after - before > min_delta_ms:
+            regressions.append((name, before, after))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', choices=sorted(SIZES), default='small',
+                        help='Preset campus size (default: small)')
+    parser.add_argument('--professors', type=int, help='Override the number of professors')
+    parser.add_argument('--schedules', type=int, help='Override the number of schedules')
+    parser.add_argument('--users', type=int, help='Override the number of users')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per function (default: 5)')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown as a fraction of the baseline (default: 0.25)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.1,
+                        help='Ignore slowdowns smaller than this (default: 0.1)')
+    parser.add_argument('--memory', action='store_true',
+                        help='Run against a shared in-memory database instead of a temp file')
+    parser.add_argument('--import-budget-ms', type=float,
+                        help='Fail if a cold import of database.py takes longer than this')
+    args = parser.parse_args(argv)
+
+    professors, schedules, users = SIZES[args.size]
+    professors = args.professors or professors
+    schedules = args.schedules if args.schedules is not None else schedules
+    users = args.users or users
+    repeat = max(1, args.repeat)
+    if professors < repeat * 4 + 2 or users < repeat * 2 + 2 or schedules < repeat * 2:
+        parser.error('campus is too small for the number of repeats')
+
+    import_ms, import_files = measure_import()
+    print(f"{'import database':<32} {import_ms:>12.3f} ms")
+
+    db = importlib.import_module('database')
+    if args.memory:
+        location = 'memory:profbook-bench'
+    else:
+        location = os.path.join(tempfile.mkdtemp(prefix='profbook-bench-'), 'bench.db')
+    db.configure(location)
+
+    print(f"Building campus: {professors} professors, {schedules} schedules, {users} users")
+    start = time.perf_counter()
+    campus = build_campus(db, professors, schedules, users)
+    print(f"Built in {time.perf_counter() - start:.1f} s ({location})")
+
+    results, missing = run_benchmarks(db, campus, repeat)
+    db.close_db()
+    for name in missing:
+        print(f"warning: no benchmark case for {name}", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'size': args.size,
+            'professors': professors,
+            'schedules': schedules,
+            'users': users,
+            'repeat': repeat,
+            'memory': args.memory,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version
+        },
+        'import_ms': round(import_ms, 3),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if import_files:
+        print(f"FAIL importing database created files: {', '.join(import_files)}")
+        failed = True
+    if args.import_budget_ms is not None and import_ms > args.import_budget_ms:
+        print(f"FAIL import took {import_ms:.1f} ms, budget is {args.import_budget_ms:.1f} ms")
+        failed = True
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for key in ('professors', 'schedules', 'users'):
+            if baseline.get('meta', {}).get(key) != report['meta'][key]:
+                print(f"warning: baseline {key} differs from this run", file=sys.stderr)
+        regressions = compare(results, baseline.get('results', {}), args.tolerance, args.min_delta_ms)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms")
+        if regressions:
+            return 1
+        print('No regressions against baseline')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,513 +2,2242 @@ __all__ = [
     'verify_user',
     'get_all_professors',
     'get_professor_by_name',
+    'get_professor_by_id',
+    'get_professor_directory',
+    'search_professors',
     'get_professor_schedule',
     'update_professor_schedule',
+    'update_professor_schedule_by_id',
     'update_professor',
+    'update_professor_by_id',
     'update_professor_picture',
+    'update_professor_picture_by_id',
     'get_all_users',
+    'get_user_by_id',
+    'iter_professors',
+    'iter_users',
+    'iter_schedules',
+    'get_professors_page',
+    'get_users_page',
     'add_user',
+    'bulk_add_users',
     'delete_user',
+    'delete_user_by_id',
+    'create_session',
+    'resume_session',
+    'end_session',
+    'purge_expired_sessions',
     'delete_professor',
+    'delete_professor_by_id',
+    'delete_professors',
     'close_db',
+    'configure',
     'add_schedule',
     'delete_schedule',
     'get_schedules_by_day',
+    'get_schedules_in_range',
+    'available_professors',
+    'next_free_slot',
+    'find_schedule_conflicts',
+    'audit_schedule_conflicts',
+    'parse_weekday',
+    'parse_time',
+    'parse_time_range',
     'add_professor',
-    'update_single_schedule'
+    'bulk_add_professors',
+    'bulk_add_schedules',
+    'update_single_schedule',
+    'get_connection_stats',
+    'get_change_marker',
+    'set_pragma_profile',
+    'get_db_diagnostics',
+    'get_cache_stats',
+    'clear_cache',
+    'enable_sql_trace',
+    'disable_sql_trace',
+    'get_sql_stats',
+    'reset_sql_stats',
+    'ProfessorRecord',
+    'ScheduleRecord',
+    'UserRecord',
+    'DirectoryRecord'
 ]
 
 import sqlite3
+import logging
 import os
-import hashlib
 import atexit
+import threading
+import re
+import functools
+import bisect
+import hashlib
+import json
+import secrets
+import time
+from collections import namedtuple
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from app_logging import get_logger, timed
+import sql_trace
+import passwords
+
+logger = get_logger('database')
+
+_DEFAULT_DB_PATH = os.path.join('data', 'professor_checker.db')
+
+# Where connections go: a file path, a 'file:' URI (e.g. a read-only
+# replica) or a named shared in-memory database. Chosen by configure() or
+# PROFBOOK_DB; resolved on first connection.
+_DatabaseTarget = namedtuple('_DatabaseTarget', 'location uri read_only in_memory')
+_db_target = None
+_memory_anchor = None  # Keeps a shared in-memory database alive across close_db()
+
+# Set up by _bootstrap() on first connection, never at import
+_bootstrap_lock = threading.Lock()
+_bootstrapped = False
+
+# Connection manager state: one long-lived connection per thread
+_local = threading.local()
+_connections_lock = threading.Lock()
+_open_connections = {}  # connection -> the thread that opened it
+_connection_generation = 0  # Bumped by close_db() so threads reopen afterwards
+_connection_stats = {'opens': 0, 'reuses': 0, 'closes': 0}
+
+# Named PRAGMA profiles applied to every new connection, in this order.
+# cache_size is in KiB when negative (SQLite convention), mmap_size in bytes.
+_PRAGMA_PROFILES = {
+    'default': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 0,
+    },
+}
+
+# Read-through cache for directory reads. Entries are tagged with the
+# generation they were loaded in; every write bumps the generation.
+_cache_lock = threading.Lock()
+_cache = {}
+_cache_generation = 0
+_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+_STREAM_CHUNK = 1000  # Rows per fetchmany() in the iter_* readers
+
+# Availability index: professor id -> (starts, ends) of merged busy
+# intervals in minutes since Monday 00:00. Rebuilt per professor when
+# their schedules change; None until first use.
+_availability_lock = threading.Lock()
+_availability_index = None
+_availability_dirty = set()
+_MINUTES_PER_WEEK = 7 * 1440
+
+# Conflict index: professor id -> {weekday: _IntervalList}, loaded per
+# professor on first check and dropped when their schedules change. A
+# load only stores its result if the professor's generation (and the
+# epoch, bumped when the whole index is dropped) did not move meanwhile.
+_conflict_index = {}
+_conflict_generations = {}
+_conflict_epoch = 0
+
+_WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+_WEEKDAY_INDEX = {}
+for _index, _day in enumerate(_WEEKDAYS):
+    _WEEKDAY_INDEX[_day.lower()] = _index
+    _WEEKDAY_INDEX[_day[:3].lower()] = _index
+del _index, _day
+_TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})\s*([AP]M)$')
+
+_pragma_profile_name = os.environ.get('PROFBOOK_PRAGMA_PROFILE', 'default')
+_pragma_overrides = {}
+
+# Opt-in statement timing, see sql_trace.py
+_sql_trace_enabled = os.environ.get('PROFBOOK_SQL_TRACE', '') not in ('', '0')
+
+class _RecordMixin:
+    """Lets immutable row records also be read like the dicts they replace"""
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            # Only field names; 'count' or 'index' are tuple methods, not columns
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+        
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+class ProfessorRecord(_RecordMixin, namedtuple('ProfessorRecord',
+        'id name department contact email picture')):
+    """Immutable professors row"""
+    __slots__ = ()
+
+class ScheduleRecord(_RecordMixin, namedtuple('ScheduleRecord',
+        'id professor_id professor_name day start_time end_time subject '
+        'weekday start_minute end_minute')):
+    """Immutable schedules row joined with the professor's name
+    
+    weekday (0 = Monday) and start_minute/end_minute (minutes since
+    midnight) are None when the stored text could not be parsed.
+    """
+    __slots__ = ()
+
+class UserRecord(_RecordMixin, namedtuple('UserRecord', 'id username email role')):
+    """Immutable users row without the password hash"""
+    __slots__ = ()
+
+class DirectoryRecord(_RecordMixin, namedtuple('DirectoryRecord',
+        'id name department contact email picture schedule_count next_class')):
+    """Professor with schedule summary; next_class is a ScheduleRecord or None"""
+    __slots__ = ()
+
+def _record_factory(record_class):
+    """Build a cursor row_factory that produces record_class instances"""
+    make = record_class._make
+    return lambda cursor, row: make(row)
+
+_professor_row = _record_factory(ProfessorRecord)
+_schedule_row = _record_factory(ScheduleRecord)
+_user_row = _record_factory(UserRecord)
+
+_PROFESSOR_COLUMNS = 'id, name, department, contact, email, picture'
+_USER_COLUMNS = 'id, username, email, role'
+_SCHEDULE_COLUMNS = ('s.id, s.professor_id, p.name AS professor_name, '
+                     's.day, s.start_time, s.end_time, s.subject, '
+                     's.weekday, s.start_minute, s.end_minute')
+
+# Columns the paged listings may sort by; each has an index (migration 6)
+_PROFESSOR_SORT_KEYS = ('name', 'department')
+_USER_SORT_KEYS = ('username', 'role')
+
+def parse_weekday(day):
+    """Convert a day name like 'Monday' or 'mon' to 0-6 (Monday = 0)
+    
+    Raises:
+        ValueError: If the day is not recognised
+    """
+    if isinstance(day, int) and 0 <= day <= 6:
+        return day
+    try:
+        return _WEEKDAY_INDEX[day.strip().lower()]
+    except (AttributeError, KeyError):
+        raise ValueError(f"Invalid day: {day}")
+
+@functools.lru_cache(maxsize=2048)
+def parse_time(time_str):
+    """Convert a 12-hour time like '9:00 AM' to minutes since midnight
+    
+    Raises:
+        ValueError: With a message suitable for showing to the user
+    """
+    text = time_str.strip().upper()
+    match = _TIME_PATTERN.match(text)
+    if not match:
+        if 'AM' not in text and 'PM' not in text:
+            raise ValueError("Times must include AM or PM")
+        if ':' not in text:
+            raise ValueError("Times must be in HH:MM format")
+        raise ValueError(f"Invalid time format: {time_str}")
+        
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if hour < 1 or hour > 12 or minute > 59:
+        raise ValueError(f"Invalid time format: {time_str}")
+    return (hour % 12 + (12 if match.group(3) == 'PM' else 0)) * 60 + minute
+
+def parse_time_range(time_str):
+    """Split and validate a range like '9:00 AM - 10:30 AM'
+    
+    Returns:
+        tuple: (start_time, end_time, start_minute, end_minute)
+        
+    Raises:
+        ValueError: With a message suitable for showing to the user
+    """
+    if '-' not in time_str:
+        raise ValueError("Time must contain a hyphen (-) to separate start and end times")
+    parts = time_str.split('-')
+    if len(parts) != 2:
+        raise ValueError("Time must contain exactly one hyphen (-)")
+        
+    start_time, end_time = parts[0].strip(), parts[1].strip()
+    start_minute = parse_time(start_time)
+    end_minute = parse_time(end_time)
+    if end_minute <= start_minute:
+        raise ValueError("End time must be after start time")
+    return start_time, end_time, start_minute, end_minute
+
+def _schedule_numbers(day, start_time, end_time):
+    """Numeric (weekday, start_minute, end_minute); None where unparseable"""
+    numbers = []
+    for parse, value in ((parse_weekday, day), (parse_time, start_time), (parse_time, end_time)):
+        try:
+            numbers.append(parse(value))
+        except (ValueError, AttributeError, TypeError):
+            numbers.append(None)
+    return tuple(numbers)
+
+def _create_base_tables(cursor):
+    """Migration 1: create the users, professors and schedules tables"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            email TEXT NOT NULL,
+            role TEXT NOT NULL
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS professors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            department TEXT NOT NULL,
+            contact TEXT NOT NULL,
+            email TEXT NOT NULL,
+            picture TEXT
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            professor_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            FOREIGN KEY (professor_id) REFERENCES professors (id)
+        )
+    ''')
+    
+    # Add default admin user unless one already exists
+    cursor.execute(
+        'INSERT OR IGNORE INTO users (username, password, email, role) VALUES (?, ?, ?, ?)',
+        ('admin', passwords.hash_password('admin123'), 'admin@example.com', 'admin')
+    )
+
+def _add_professor_contact_columns(cursor):
+    """Migration 2: add contact and email columns to older professors tables"""
+    cursor.execute('PRAGMA table_info(professors)')
+    columns = {row[1] for row in cursor.fetchall()}
+    if 'contact' in columns and 'email' in columns:
+        return
+        
+    if 'contact' not in columns:
+        cursor.execute('ALTER TABLE professors ADD COLUMN contact TEXT')
+    if 'email' not in columns:
+        cursor.execute('ALTER TABLE professors ADD COLUMN email TEXT')
+    
+    # Update existing professors with sample data
+    sample_data = {
+        'Dr. Charles Tabares': ('+63 912 345 6789', 'charles.tabares@university.edu'),
+        'Dr. Wensley Naarte': ('+63 923 456 7890', 'wensley.naarte@university.edu'),
+        'Mr. Brian Sarmiento': ('+63 934 567 8901', 'brian.sarmiento@university.edu'),
+        'Dr. Maria Santos': ('+63 945 678 9012', 'maria.santos@university.edu'),
+    }
+    
+    for name, (contact, email) in sample_data.items():
+        cursor.execute('''
+            UPDATE professors 
+            SET contact = ?, email = ?
+            WHERE name = ?
+        ''', (contact, email, name))
+
+def _has_index_on(cursor, table, columns):
+    """Check whether an index on table starts with exactly these columns"""
+    cursor.execute(f'PRAGMA index_list({table})')
+    for index in cursor.fetchall():
+        cursor.execute(f'PRAGMA index_info("{index[1]}")')
+        indexed = [row[2] for row in sorted(cursor.fetchall())]
+        if indexed[:len(columns)] == list(columns):
+            return True
+    return False
+
+def _add_lookup_indexes(cursor):
+    """Migration 3: index the columns used by name and schedule lookups"""
+    # users.username is UNIQUE in tables created by migration 1, which
+    # already gives it an index; only older tables need one added
+    if not _has_index_on(cursor, 'users', ['username']):
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users (username)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_professors_name ON professors (name)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_professor_day_start
+        ON schedules (professor_id, day, start_time)
+    ''')
+
+def _create_professor_search_index(cursor):
+    """Migration 4: full-text index over professor name, department and contacts"""
+    cursor.execute('PRAGMA compile_options')
+    if 'ENABLE_FTS5' not in {row[0] for row in cursor.fetchall()}:
+        # search_professors() falls back to LIKE scans without FTS5
+        logger.debug("SQLite built without FTS5, skipping search index")
+        return
+        
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS professors_fts USING fts5(
+            name, department, contact, email,
+            content='professors', content_rowid='id'
+        )
+    ''')
+    
+    # Keep the index in sync with the professors table
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS professors_fts_insert AFTER INSERT ON professors BEGIN
+            INSERT INTO professors_fts (rowid, name, department, contact, email)
+            VALUES (new.id, new.name, new.department, new.contact, new.email);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS professors_fts_delete AFTER DELETE ON professors BEGIN
+            INSERT INTO professors_fts (professors_fts, rowid, name, department, contact, email)
+            VALUES ('delete', old.id, old.name, old.department, old.contact, old.email);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS professors_fts_update
+        AFTER UPDATE OF name, department, contact, email ON professors BEGIN
+            INSERT INTO professors_fts (professors_fts, rowid, name, department, contact, email)
+            VALUES ('delete', old.id, old.name, old.department, old.contact, old.email);
+            INSERT INTO professors_fts (rowid, name, department, contact, email)
+            VALUES (new.id, new.name, new.department, new.contact, new.email);
+        END
+    ''')
+    
+    # Index the professors that already exist
+    cursor.execute("INSERT INTO professors_fts (professors_fts) VALUES ('rebuild')")
+
+def _add_schedule_time_columns(cursor):
+    """Migration 5: numeric weekday and minute columns for schedules"""
+    cursor.execute('PRAGMA table_info(schedules)')
+    columns = {row[1] for row in cursor.fetchall()}
+    for column in ('weekday', 'start_minute', 'end_minute'):
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE schedules ADD COLUMN {column} INTEGER')
+    
+    # Backfill from the text columns
+    cursor.execute('SELECT id, day, start_time, end_time FROM schedules')
+    updates = [_schedule_numbers(day, start, end) + (schedule_id,)
+               for schedule_id, day, start, end in cursor.fetchall()]
+    cursor.executemany(
+        'UPDATE schedules SET weekday = ?, start_minute = ?, end_minute = ? WHERE id = ?',
+        updates
+    )
+    
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_weekday_start
+        ON schedules (weekday, start_minute)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_professor_weekday_start
+        ON schedules (professor_id, weekday, start_minute)
+    ''')
+
+def _add_sort_indexes(cursor):
+    """Migration 6: index every column the paged listings can sort by
+    
+    SQLite appends the rowid to each index entry, so an index on the sort
+    column also covers the (column, id) keyset used as the page cursor.
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_professors_department ON professors (department)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_role ON users (role)')
+
+def _create_sessions_table(cursor):
+    """Migration 7: remember-me sessions keyed by a hash of their token"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token_hash TEXT NOT NULL UNIQUE,
+            user_id INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    ''')
+    # token_hash is UNIQUE, which already indexes the login lookup
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_id)')
+
+def _cascade_schedule_deletes(cursor):
+    """Migration 8: rebuild schedules with ON DELETE CASCADE to professors
+    
+    SQLite cannot alter a foreign key, so the table is copied into a new
+    one and swapped in. Schedules whose professor no longer exists are
+    invisible to every query (they all join professors) and cannot be
+    copied under the new constraint, so they are dropped.
+    """
+    cursor.execute('PRAGMA foreign_key_list(schedules)')
+    if any(row[2] == 'professors' and row[6].upper() == 'CASCADE' for row in cursor.fetchall()):
+        return
+        
+    cursor.execute('''
+        CREATE TABLE schedules_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            professor_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            weekday INTEGER,
+            start_minute INTEGER,
+            end_minute INTEGER,
+            FOREIGN KEY (professor_id) REFERENCES professors (id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO schedules_new (id, professor_id, day, start_time, end_time, subject,
+                                   weekday, start_minute, end_minute)
+        SELECT s.id, s.professor_id, s.day, s.start_time, s.end_time, s.subject,
+               s.weekday, s.start_minute, s.end_minute
+        FROM schedules s
+        WHERE EXISTS (SELECT 1 FROM professors p WHERE p.id = s.professor_id)
+    ''')
+    copied = cursor.rowcount
+    
+    # Keep AUTOINCREMENT from handing out ids of deleted schedules again
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'schedules'")
+    row = cursor.fetchone()
+    last_id = row[0] if row else 0
+    cursor.execute('SELECT COUNT(*) FROM schedules')
+    orphans = cursor.fetchone()[0] - copied
+    
+    cursor.execute('DROP TABLE schedules')
+    cursor.execute('ALTER TABLE schedules_new RENAME TO schedules')
+    cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'schedules'", (last_id,))
+    if cursor.rowcount == 0 and last_id:
+        cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('schedules', ?)", (last_id,))
+    if orphans:
+        logger.warning("Dropped %s schedules of professors that no longer exist", orphans)
+        
+    # DROP TABLE took the indexes with it
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_professor_day_start
+        ON schedules (professor_id, day, start_time)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_weekday_start
+        ON schedules (weekday, start_minute)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_professor_weekday_start
+        ON schedules (professor_id, weekday, start_minute)
+    ''')
+
+# Ordered schema migrations; PRAGMA user_version records the last one applied.
+# Migrations upgrade data in place and must never drop user data.
+_MIGRATIONS = [
+    (1, _create_base_tables),
+    (2, _add_professor_contact_columns),
+    (3, _add_lookup_indexes),
+    (4, _create_professor_search_index),
+    (5, _add_schedule_time_columns),
+    (6, _add_sort_indexes),
+    (7, _create_sessions_table),
+    (8, _cascade_schedule_deletes),
+]
+_SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+def _migrate(conn):
+    """Apply any pending migrations to the database
+    
+    Each migration runs in its own transaction together with the
+    user_version bump, so an interrupted upgrade resumes where it stopped.
+    
+    Returns:
+        int: Schema version after migrating
+    """
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for target, migration in _MIGRATIONS:
+        if target <= version:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            # Another connection may have migrated while we waited for the lock
+            if cursor.execute('PRAGMA user_version').fetchone()[0] >= target:
+                conn.rollback()
+                continue
+            migration(cursor)
+            cursor.execute(f'PRAGMA user_version = {target}')
+            conn.commit()
+            logger.debug("Database migrated to schema version %s", target)
+        except Exception as e:
+            logger.error("Error migrating database to version %s: %s", target, e)
+            conn.rollback()
+            raise
+        version = target
+    return version
+
+def _bootstrap():
+    """One-time setup deferred from import time to the first connection
+    
+    Importing this module touches no files; the exit hook is only
+    registered once something actually queries.
+    """
+    global _bootstrapped
+    
+    if _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if _bootstrapped:
+            return
+        atexit.register(close_db)
+        _bootstrapped = True
+
+def _resolve_target(path):
+    """Work out how to open the database named by path
+    
+    Args:
+        path (str): File path, 'file:' URI, or 'memory:<name>' for a named
+            shared-cache in-memory database (':memory:' means
+            'memory:profbook')
+    
+    Returns:
+        _DatabaseTarget: Location to pass to sqlite3.connect and its flags
+    """
+    if path == ':memory:':
+        path = 'memory:profbook'
+    if path.startswith('memory:'):
+        name = path[len('memory:'):] or 'profbook'
+        return _DatabaseTarget(f'file:{name}?mode=memory&cache=shared', True, False, True)
+    if path.startswith('file:'):
+        query = parse_qs(path.partition('?')[2])
+        mode = query.get('mode', [''])[-1]
+        read_only = mode == 'ro' or query.get('immutable', [''])[-1] == '1'
+        return _DatabaseTarget(path, True, read_only, mode == 'memory')
+    return _DatabaseTarget(path, False, False, False)
+
+def _get_target():
+    """Get the configured database, falling back to PROFBOOK_DB or the default file"""
+    global _db_target
+    
+    if _db_target is None:
+        _db_target = _resolve_target(os.environ.get('PROFBOOK_DB') or _DEFAULT_DB_PATH)
+    return _db_target
+
+def configure(path=None):
+    """Choose the database that connections open from now on
+    
+    Open connections are closed and cached reads dropped, so every thread
+    reconnects to the new database on its next query.
+    
+    Args:
+        path (str, optional): One of
+            - a file path such as 'data/professor_checker.db'
+            - a 'file:' URI, e.g. 'file:/srv/replica.db?mode=ro' for a
+              read-only replica (writes then fail and return False, and
+              migrations are skipped)
+            - 'memory:<name>' for a shared in-memory database that every
+              thread sees; it lasts until configure() is called again
+            Defaults to PROFBOOK_DB, then data/professor_checker.db
+    """
+    global _db_target, _memory_anchor
+    
+    close_db()
+    with _connections_lock:
+        anchor, _memory_anchor = _memory_anchor, None
+    if anchor is not None:
+        anchor.close()
+    _db_target = _resolve_target(path or os.environ.get('PROFBOOK_DB') or _DEFAULT_DB_PATH)
+    _invalidate_cache()
+    _mark_schedules_changed()
+    logger.debug("Database configured: %s", _db_target.location)
+
+def _open_connection(target, factory):
+    """Open a connection to target, creating its directory or keeping it alive as needed"""
+    global _memory_anchor
+    
+    if not target.uri:
+        directory = os.path.dirname(target.location)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    elif target.in_memory:
+        # A shared in-memory database vanishes with its last connection
+        with _connections_lock:
+            if _memory_anchor is None:
+                _memory_anchor = sqlite3.connect(target.location, uri=True, check_same_thread=False)
+    return sqlite3.connect(target.location, uri=target.uri, check_same_thread=False, factory=factory)
+
+@timed(logger)
+def init_db():
+    """Create or upgrade the database schema without dropping any data"""
+    try:
+        conn = get_db_connection()
+        _migrate(conn)
+        logger.debug("Database initialized successfully")
+        
+    except Exception as e:
+        logger.error("Error initializing database: %s", e)
+
+def get_db_connection():
+    """Get the calling thread's connection to the SQLite database
+    
+    The first call on a thread opens the connection; every later call on
+    that thread reuses it until close_db() is called.
+    
+    Returns:
+        sqlite3.Connection: Database connection object
+    """
+    conn = getattr(_local, 'connection', None)
+    if conn is not None and _local.generation == _connection_generation:
+        with _connections_lock:
+            _connection_stats['reuses'] += 1
+        return conn
+        
+    try:
+        _bootstrap()
+        target = _get_target()
+        logger.debug("Opening database at: %s", target.location)
+        
+        # Create connection (closed from the main thread by close_db at exit)
+        factory = sql_trace.TracingConnection if _sql_trace_enabled else sqlite3.Connection
+        conn = _open_connection(target, factory)
+        conn.row_factory = sqlite3.Row
+        
+        # Enable foreign keys and apply the tuning profile
+        conn.execute('PRAGMA foreign_keys = ON')
+        _apply_pragmas(conn, target.read_only)
+        
+        # Bring the schema up to date before anyone queries it
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < _SCHEMA_VERSION:
+                if target.read_only:
+                    logger.warning("Read-only database is at schema version %s, expected %s",
+                                   version, _SCHEMA_VERSION)
+                else:
+                    _migrate(conn)
+        except Exception:
+            conn.close()
+            raise
+        
+        # Remember it for this thread, and close any left behind by
+        # threads that have exited (worker pools that were shut down)
+        _local.connection = conn
+        _local.generation = _connection_generation
+        with _connections_lock:
+            orphans = [c for c, thread in _open_connections.items() if not thread.is_alive()]
+            for orphan in orphans:
+                del _open_connections[orphan]
+            _open_connections[conn] = threading.current_thread()
+            _connection_stats['opens'] += 1
+        _close_connections(orphans)
+        
+        return conn
+        
+    except Exception as e:
+        logger.error("Error connecting to database: %s", e)
+        return None
+
+def _get_pragma_settings():
+    """Get the PRAGMA values of the selected profile with overrides applied"""
+    settings = dict(_PRAGMA_PROFILES.get(_pragma_profile_name, _PRAGMA_PROFILES['default']))
+    settings.update(_pragma_overrides)
+    return settings
+
+def _apply_pragmas(conn, read_only=False):
+    """Apply the selected PRAGMA profile to a new connection
+    
+    A read-only database keeps whatever journal mode it was written with.
+    """
+    for pragma, value in _get_pragma_settings().items():
+        if read_only and pragma == 'journal_mode':
+            continue
+        try:
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        except sqlite3.DatabaseError as e:
+            logger.warning("Could not set PRAGMA %s: %s", pragma, e)
+
+def set_pragma_profile(name='default', cache_size=None, mmap_size=None):
+    """Select the PRAGMA profile used for database connections
+    
+    Open connections are closed so every thread reconnects with the new
+    settings on its next query.
+    
+    Args:
+        name (str): Profile name ('default', 'safe' or 'legacy')
+        cache_size (int, optional): Page cache override (negative = KiB)
+        mmap_size (int, optional): Memory-mapped I/O size override in bytes
+        
+    Returns:
+        bool: True if the profile was selected, False if it is unknown
+    """
+    global _pragma_profile_name, _pragma_overrides
+    
+    if name not in _PRAGMA_PROFILES:
+        logger.warning("Unknown pragma profile: %s", name)
+        return False
+        
+    overrides = {}
+    if cache_size is not None:
+        overrides['cache_size'] = int(cache_size)
+    if mmap_size is not None:
+        overrides['mmap_size'] = int(mmap_size)
+        
+    _pragma_profile_name = name
+    _pragma_overrides = overrides
+    close_db()
+    return True
+
+def enable_sql_trace(slow_ms=100, slow_log_path=None):
+    """Time every SQL statement on connections opened from now on
+    
+    Open connections are closed so every thread reconnects traced.
+    
+    Args:
+        slow_ms (float): Statements at or above this duration are logged
+        slow_log_path (str, optional): File for the slow-query log
+    """
+    global _sql_trace_enabled
+    
+    sql_trace.configure(slow_ms, slow_log_path)
+    _sql_trace_enabled = True
+    close_db()
+
+def disable_sql_trace():
+    """Stop tracing; recorded statistics are kept until reset_sql_stats()"""
+    global _sql_trace_enabled
+    
+    _sql_trace_enabled = False
+    close_db()
+
+def get_sql_stats():
+    """Get per-statement timings recorded while tracing
+    
+    Returns:
+        dict: 'statements' sorted by total time, each with sql, count,
+            params, rows, total_ms, p50_ms, p95_ms, p99_ms and max_ms;
+            plus 'traced' and 'slow_ms'
+    """
+    return sql_trace.summary()
+
+def reset_sql_stats():
+    """Discard the statistics recorded so far"""
+    sql_trace.reset()
 
-_db_connection = None
-_SCHEMA_VERSION = 2  # Increment this when schema changes
+@timed(logger)
+def get_db_diagnostics():
+    """Report the PRAGMA profile and the values in effect on this thread
+    
+    Returns:
+        dict: Database location and mode, profile name, requested
+            settings, the values SQLite reports for them, and the
+            connection counters
+    """
+    settings = _get_pragma_settings()
+    effective = {}
+    try:
+        conn = get_db_connection()
+        for pragma in list(settings) + ['foreign_keys', 'page_size']:
+            row = conn.execute(f'PRAGMA {pragma}').fetchone()
+            effective[pragma] = row[0] if row else None
+    except Exception as e:
+        logger.error("Error reading diagnostics: %s", e)
+        
+    target = _get_target()
+    return {
+        'database': target.location,
+        'read_only': target.read_only,
+        'in_memory': target.in_memory,
+        'profile': _pragma_profile_name,
+        'requested': settings,
+        'effective': effective,
+        'connections': get_connection_stats()
+    }
+
+def get_connection_stats():
+    """Get connection manager counters
+    
+    Returns:
+        dict: Counts of connections opened, reused and closed, plus the
+            number currently open
+    """
+    with _connections_lock:
+        stats = dict(_connection_stats)
+        stats['open'] = len(_open_connections)
+    return stats
+
+def get_change_marker():
+    """Get a cheap value that changes whenever the database may have changed
+    
+    PRAGMA data_version moves when any other connection (another thread
+    or process) commits, and total_changes counts this connection's own
+    writes, so pollers can skip re-reading when neither has moved.
+    Connections are per thread, so only compare markers taken on the
+    same thread.
+    
+    Returns:
+        tuple: Opaque marker, or None on error (treat as changed)
+    """
+    try:
+        conn = get_db_connection()
+        version = conn.execute('PRAGMA data_version').fetchone()[0]
+        return (id(conn), version, conn.total_changes)
+    except Exception as e:
+        logger.error("Error reading change marker: %s", e)
+        return None
+
+def _copy_cached(value):
+    """Copy a cached list so callers cannot mutate the cache
+    
+    Records inside are immutable and shared as-is.
+    """
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+def _read_through(key, loader, *args):
+    """Serve key from the cache, calling loader(*args) on a miss
+    
+    Exceptions from the loader propagate and nothing is cached.
+    """
+    with _cache_lock:
+        generation = _cache_generation
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == generation:
+            _cache_stats['hits'] += 1
+            return _copy_cached(entry[1])
+        _cache_stats['misses'] += 1
+        
+    value = loader(*args)
+    
+    with _cache_lock:
+        # Skip storing if a write happened while we were loading
+        if generation == _cache_generation:
+            _cache[key] = (generation, value)
+    return _copy_cached(value)
+
+def _invalidate_cache():
+    """Bump the cache generation after a committed write"""
+    global _cache_generation
+    
+    with _cache_lock:
+        _cache_generation += 1
+        _cache.clear()
+        _cache_stats['invalidations'] += 1
+
+def clear_cache():
+    """Drop every cached read"""
+    _invalidate_cache()
+
+def get_cache_stats():
+    """Get read cache counters
+    
+    Returns:
+        dict: Hits, misses, invalidations, current generation and the
+            number of cached entries
+    """
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats['generation'] = _cache_generation
+        stats['entries'] = len(_cache)
+    return stats
+
+def _stream(row_factory, query, params=()):
+    """Yield rows of a query, fetching _STREAM_CHUNK at a time
+    
+    A missing table is migrated once and the query retried, as the
+    list readers always did.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    try:
+        cursor.execute(query, params)
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e).lower() and "no such column" not in str(e).lower():
+            raise
+        logger.debug("Table missing for streamed query, migrating database")
+        _migrate(conn)
+        cursor.execute(query, params)
+        
+    try:
+        while True:
+            rows = cursor.fetchmany(_STREAM_CHUNK)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+def iter_professors():
+    """Stream every professor ordered by name
+    
+    Rows are read from the cursor in chunks, so memory use does not grow
+    with the size of the table.
+    
+    Yields:
+        ProfessorRecord: One per professor
+        
+    Raises:
+        sqlite3.Error: If the query fails
+    """
+    return _stream(_professor_row,
+                   f'SELECT {_PROFESSOR_COLUMNS} FROM professors ORDER BY name')
+
+def iter_users():
+    """Stream every user ordered by username
+    
+    Yields:
+        UserRecord: One per user (the password hash is not read)
+        
+    Raises:
+        sqlite3.Error: If the query fails
+    """
+    return _stream(_user_row, f'SELECT {_USER_COLUMNS} FROM users ORDER BY username')
+
+def iter_schedules(day=None):
+    """Stream the schedules of one day, or of every day when day is None
+    
+    Classes are ordered by weekday and start time; rows whose day or
+    times could not be parsed come last, ordered by their text.
+    
+    Args:
+        day (str, optional): Day name like 'Monday' or 'mon'
+        
+    Yields:
+        ScheduleRecord: One per class
+        
+    Raises:
+        sqlite3.Error: If the query fails
+    """
+    select = f'SELECT {_SCHEDULE_COLUMNS} FROM schedules s JOIN professors p ON s.professor_id = p.id'
+    if day:
+        try:
+            weekday = parse_weekday(day)
+        except ValueError:
+            weekday = None
+            
+        if weekday is not None:
+            yield from _stream(_schedule_row, f'{select} WHERE s.weekday = ? ORDER BY s.start_minute',
+                               (weekday,))
+        else:
+            yield from _stream(_schedule_row, f'{select} WHERE s.day = ? ORDER BY s.start_time',
+                               (day,))
+        return
+        
+    # Two index-ordered passes rather than one sort over the whole table
+    yield from _stream(_schedule_row,
+                       f'{select} WHERE s.weekday IS NOT NULL ORDER BY s.weekday, s.start_minute')
+    yield from _stream(_schedule_row,
+                       f'{select} WHERE s.weekday IS NULL ORDER BY s.day, s.start_time')
+
+@timed(logger)
+def get_all_professors():
+    """Get all professors from database"""
+    try:
+        return _read_through(('professors',), _load_all_professors)
+    except Exception as e:
+        logger.error("Error getting professors: %s", e)
+        return []
+
+def _load_all_professors():
+    """Query all professors, migrating first if the table is missing"""
+    professors = list(iter_professors())
+    logger.debug("Found %s professors", len(professors))
+    return professors
+
+def _load_page(cursor, table, columns, sort, after, limit):
+    """Fetch one keyset page ordered by (sort, id)
+    
+    One row past the limit is read to tell whether another page follows.
+    """
+    if after is None:
+        cursor.execute(f'SELECT {columns} FROM {table} ORDER BY {sort}, id LIMIT ?',
+                       (limit + 1,))
+    else:
+        cursor.execute(f'''
+            SELECT {columns} FROM {table}
+            WHERE ({sort}, id) > (?, ?)
+            ORDER BY {sort}, id LIMIT ?
+        ''', (after[0], after[1], limit + 1))
+    rows = cursor.fetchall()
+    
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (getattr(last, sort), last.id)
+
+@timed(logger)
+def get_professors_page(after=None, limit=100, sort='name'):
+    """Get one page of professors without reading the rest of the table
+    
+    Args:
+        after (tuple, optional): Cursor returned with the previous page;
+            None starts from the beginning
+        limit (int, optional): Maximum number of professors on the page
+        sort (str, optional): 'name' or 'department'
+        
+    Returns:
+        tuple: (list of ProfessorRecord, cursor for the next page or None)
+        
+    Raises:
+        ValueError: If sort is not a supported column
+    """
+    if sort not in _PROFESSOR_SORT_KEYS:
+        raise ValueError(f"Cannot sort professors by {sort}")
+    try:
+        cursor = get_db_connection().cursor()
+        cursor.row_factory = _professor_row
+        return _load_page(cursor, 'professors', _PROFESSOR_COLUMNS, sort, after, limit)
+    except Exception as e:
+        logger.error("Error getting professors page: %s", e)
+        return [], None
+
+@timed(logger)
+def get_professor_by_name(name):
+    """Get professor details by name"""
+    try:
+        return _read_through(('professor', name), _load_professor_by_name, name)
+    except Exception as e:
+        logger.error("Error getting professor: %s", e)
+        return None
+
+def _load_professor_by_name(name):
+    """Query one professor by name"""
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = _professor_row
+    
+    cursor.execute(f'SELECT {_PROFESSOR_COLUMNS} FROM professors WHERE name = ?', (name,))
+    return cursor.fetchone()
+
+@timed(logger)
+def get_professor_by_id(professor_id):
+    """Get professor details by primary key"""
+    try:
+        return _read_through(('professor_id', professor_id), _load_professor_by_id, professor_id)
+    except Exception as e:
+        logger.error("Error getting professor: %s", e)
+        return None
+
+def _load_professor_by_id(professor_id):
+    """Query one professor by id"""
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = _professor_row
+    
+    cursor.execute(f'SELECT {_PROFESSOR_COLUMNS} FROM professors WHERE id = ?', (professor_id,))
+    return cursor.fetchone()
+
+def _professor_id(name):
+    """Look up a professor's id by name for the name-based wrappers
+    
+    Returns:
+        int: The id, or None if there is no such professor or the query fails
+    """
+    try:
+        cursor = get_db_connection().cursor()
+        cursor.execute('SELECT id FROM professors WHERE name = ?', (name,))
+        row = cursor.fetchone()
+    except Exception as e:
+        logger.error("Error looking up professor: %s", e)
+        return None
+    if not row:
+        logger.debug("Professor %s not found", name)
+        return None
+    return row[0]
+
+def _minutes_until(weekday, start_minute, now):
+    """Minutes from now until the next occurrence of a weekly class, or None"""
+    if weekday is None or start_minute is None:
+        return None
+    now_minutes = now.weekday() * 1440 + now.hour * 60 + now.minute
+    return (weekday * 1440 + start_minute - now_minutes) % (7 * 1440)
+
+@timed(logger)
+def get_professor_directory():
+    """Get every professor with picture and schedule summary in one query
+    
+    Returns:
+        list: DirectoryRecord for each professor ordered by name, with
+            schedule_count and next_class (the next upcoming ScheduleRecord,
+            or None)
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        
+        cursor.execute('''
+            SELECT p.id, p.name, p.department, p.contact, p.email, p.picture,
+                   s.id, s.day, s.start_time, s.end_time, s.subject,
+                   s.weekday, s.start_minute, s.end_minute
+            FROM professors p
+            LEFT JOIN schedules s ON s.professor_id = p.id
+            ORDER BY p.name, p.id
+        ''')
+        
+        now = datetime.now()
+        directory = []
+        professor = None
+        count = 0
+        next_class = None
+        soonest = None
+        for row in cursor:
+            if professor is None or professor[0] != row[0]:
+                if professor is not None:
+                    directory.append(DirectoryRecord(*professor, count, next_class))
+                professor = row[:6]
+                count = 0
+                next_class = None
+                soonest = None
+                
+            if row[6] is None:
+                continue
+            count += 1
+            
+            wait = _minutes_until(row[11], row[12], now)
+            if wait is not None and (soonest is None or wait < soonest):
+                soonest = wait
+                next_class = ScheduleRecord(row[6], row[0], row[1], *row[7:])
+                
+        if professor is not None:
+            directory.append(DirectoryRecord(*professor, count, next_class))
+                
+        logger.debug("Loaded directory of %s professors", len(directory))
+        return directory
+        
+    except Exception as e:
+        logger.error("Error loading professor directory: %s", e)
+        return []
+
+@timed(logger)
+def search_professors(query, limit=50):
+    """Search professors by name, department, contact or email
+    
+    Every word in the query is matched as a prefix, so 'comp sci' finds
+    'Computer Science'. Results are ranked by relevance.
+    
+    Args:
+        query (str): Search text
+        limit (int, optional): Maximum number of ids to return; None
+            returns every match
+        
+    Returns:
+        list: Matching professor ids, best match first
+    """
+    terms = re.findall(r'\w+', query or '')
+    if not terms:
+        return []
+        
+    try:
+        return _read_through(('search', tuple(t.lower() for t in terms), limit),
+                             _load_search_results, terms, limit)
+    except Exception as e:
+        logger.error("Error searching professors: %s", e)
+        return []
+
+def _load_search_results(terms, limit):
+    """Query the full-text index, or scan with LIKE when it is unavailable"""
+    cursor = get_db_connection().cursor()
+    if limit is None:
+        limit = -1  # SQLite reads a negative LIMIT as no limit
+    
+    match = ' '.join(f'"{term}"*' for term in terms)
+    try:
+        cursor.execute('''
+            SELECT rowid FROM professors_fts
+            WHERE professors_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (match, limit))
+        return [row[0] for row in cursor.fetchall()]
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e).lower():
+            raise
+            
+    # No FTS5: every term must appear somewhere in the four fields
+    conditions = []
+    params = []
+    for term in terms:
+        conditions.append("(name LIKE ? OR department LIKE ? OR contact LIKE ? OR email LIKE ?)")
+        params.extend([f'%{term}%'] * 4)
+    cursor.execute(f'''
+        SELECT id FROM professors
+        WHERE {' AND '.join(conditions)}
+        ORDER BY name
+        LIMIT ?
+    ''', params + [limit])
+    return [row[0] for row in cursor.fetchall()]
+
+def _merge_intervals(intervals):
+    """Merge busy (start, end) week-minute intervals into sorted starts and ends"""
+    starts, ends = [], []
+    for start, end in sorted(intervals):
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+def _load_busy_intervals(cursor, professor_ids=None):
+    """Query week-minute busy intervals grouped by professor id"""
+    query = '''
+        SELECT professor_id, weekday * 1440 + start_minute, weekday * 1440 + end_minute
+        FROM schedules
+        WHERE weekday IS NOT NULL AND start_minute IS NOT NULL AND end_minute IS NOT NULL
+    '''
+    params = []
+    if professor_ids is not None:
+        query += f" AND professor_id IN ({', '.join('?' * len(professor_ids))})"
+        params = list(professor_ids)
+        
+    intervals = {}
+    for professor_id, start, end in cursor.execute(query, params):
+        intervals.setdefault(professor_id, []).append((start, end))
+    return intervals
+
+def _mark_schedules_changed(professor_ids=None):
+    """Flag professors whose availability and conflict data must be recomputed
+    
+    Args:
+        professor_ids (iterable, optional): Affected professors; None
+            discards both indexes entirely
+    """
+    global _availability_index, _conflict_epoch
+    
+    with _availability_lock:
+        if professor_ids is None:
+            _availability_index = None
+            _availability_dirty.clear()
+            _conflict_index.clear()
+            _conflict_generations.clear()
+            _conflict_epoch += 1
+            return
+        professor_ids = list(professor_ids)
+        if _availability_index is not None:
+            _availability_dirty.update(professor_ids)
+        for professor_id in professor_ids:
+            _conflict_index.pop(professor_id, None)
+            _conflict_generations[professor_id] = _conflict_generations.get(professor_id, 0) + 1
+
+def _get_availability_index():
+    """Get the availability index, building or patching it as needed"""
+    global _availability_index
+    
+    with _availability_lock:
+        if _availability_index is not None and not _availability_dirty:
+            return _availability_index
+            
+        cursor = get_db_connection().cursor()
+        cursor.row_factory = None
+        
+        if _availability_index is None:
+            cursor.execute('SELECT id FROM professors')
+            ids = [row[0] for row in cursor.fetchall()]
+            busy = _load_busy_intervals(cursor)
+            index = {}
+            for professor_id in ids:
+                index[professor_id] = _merge_intervals(busy.get(professor_id, ()))
+            logger.debug("Built availability index for %s professors", len(index))
+        else:
+            dirty = list(_availability_dirty)
+            cursor.execute(f"SELECT id FROM professors WHERE id IN ({', '.join('?' * len(dirty))})", dirty)
+            existing = {row[0] for row in cursor.fetchall()}
+            busy = _load_busy_intervals(cursor, dirty)
+            # Copy so readers holding the previous index are unaffected
+            index = dict(_availability_index)
+            for professor_id in dirty:
+                if professor_id in existing:
+                    index[professor_id] = _merge_intervals(busy.get(professor_id, ()))
+                else:
+                    index.pop(professor_id, None)
+            logger.debug("Refreshed availability for %s professors", len(dirty))
+            
+        _availability_index = index
+        _availability_dirty.clear()
+        return index
+
+def _busy_until(starts, ends, moment):
+    """End of the busy interval containing moment, or None if free"""
+    position = bisect.bisect_right(starts, moment) - 1
+    if position >= 0 and ends[position] > moment:
+        return ends[position]
+    return None
+
+def _to_week_minute(moment):
+    """Convert a datetime or (weekday, minute) pair to minutes since Monday"""
+    if isinstance(moment, datetime):
+        return moment.weekday() * 1440 + moment.hour * 60 + moment.minute
+    weekday, minute = moment
+    if not isinstance(minute, int):
+        minute = parse_time(minute)
+    return parse_weekday(weekday) * 1440 + minute
+
+@timed(logger)
+def available_professors(weekday=None, minute=None):
+    """Get the professors who have no class at a given moment
+    
+    Args:
+        weekday (str or int, optional): Day name or number (Monday = 0);
+            defaults to now
+        minute (str or int, optional): '9:00 AM' or minutes since midnight;
+            defaults to now
+        
+    Returns:
+        list: Sorted ids of professors who are free at that moment
+    """
+    try:
+        if weekday is None or minute is None:
+            moment = _to_week_minute(datetime.now())
+        else:
+            moment = _to_week_minute((weekday, minute))
+            
+        index = _get_availability_index()
+        return sorted(professor_id for professor_id, (starts, ends) in index.items()
+                      if _busy_until(starts, ends, moment) is None)
+                      
+    except Exception as e:
+        logger.error("Error getting available professors: %s", e)
+        return []
 
-def init_db():
-    """Initialize the database with required tables"""
+@timed(logger)
+def next_free_slot(professor_id, start=None):
+    """Find the first moment at or after start when a professor is free
+    
+    Args:
+        professor_id (int): ID of the professor
+        start (datetime or tuple, optional): A datetime or a (weekday,
+            minute) pair; defaults to now
+            
+    Returns:
+        tuple: (weekday, minute) of the next free moment, or None if the
+            professor is unknown or busy all week
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        moment = _to_week_minute(start if start is not None else datetime.now())
+        index = _get_availability_index()
+        if professor_id not in index:
+            return None
+            
+        starts, ends = index[professor_id]
+        # Intervals are merged, so the end of a class is free unless it is
+        # Sunday midnight, where one more hop across the week boundary is needed
+        for _ in range(3):
+            busy_until = _busy_until(starts, ends, moment)
+            if busy_until is None:
+                return divmod(moment, 1440)
+            moment = busy_until % _MINUTES_PER_WEEK
+        return None
         
-        # Drop existing tables if they exist
-        cursor.execute('DROP TABLE IF EXISTS schedules')
-        cursor.execute('DROP TABLE IF EXISTS professors')
-        cursor.execute('DROP TABLE IF EXISTS users')
+    except Exception as e:
+        logger.error("Error finding next free slot: %s", e)
+        return None
+
+class _IntervalList:
+    """Schedules of one professor on one weekday, sorted by start minute
+    
+    max_ends[i] is the largest end among the first i + 1 intervals, so an
+    overlap search can stop as soon as no earlier interval reaches back.
+    
+    Finding the position is O(log n) but add() is O(n): the list inserts
+    shift the tail and max_ends may need raising after it. A list holds
+    one professor's classes on one day, a handful of entries, so that
+    beats a balanced tree. _get_conflict_intervals() reads rows ordered
+    by start, so each of its adds appends and shifts nothing.
+    """
+    __slots__ = ('starts', 'ends', 'ids', 'max_ends')
+    
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_ends = []
+        
+    def add(self, start, end, schedule_id):
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.ids.insert(position, schedule_id)
+        previous = self.max_ends[position - 1] if position else end
+        self.max_ends.insert(position, max(previous, end))
+        for i in range(position + 1, len(self.max_ends)):
+            if self.max_ends[i] >= self.max_ends[i - 1]:
+                break
+            self.max_ends[i] = self.max_ends[i - 1]
+            
+    def overlapping(self, start, end, ignore_id=None):
+        """Ids of intervals that overlap the half-open range [start, end)"""
+        found = []
+        i = bisect.bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_ends[i] > start:
+            if self.ends[i] > start and self.ids[i] != ignore_id:
+                found.append(self.ids[i])
+            i -= 1
+        return found
+
+def _get_conflict_intervals(professor_id):
+    """Get a professor's interval lists by weekday, loading them if needed"""
+    with _availability_lock:
+        intervals = _conflict_index.get(professor_id)
+        version = (_conflict_epoch, _conflict_generations.get(professor_id, 0))
+    if intervals is not None:
+        return intervals
+        
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = None
+    cursor.execute('''
+        SELECT id, weekday, start_minute, end_minute
+        FROM schedules
+        WHERE professor_id = ? AND weekday IS NOT NULL
+              AND start_minute IS NOT NULL AND end_minute IS NOT NULL
+        ORDER BY weekday, start_minute
+    ''', (professor_id,))
+    
+    intervals = {}
+    for schedule_id, weekday, start, end in cursor.fetchall():
+        intervals.setdefault(weekday, _IntervalList()).add(start, end, schedule_id)
+        
+    # A write that landed during the SELECT has already bumped the
+    # generation; caching this result would hide its class from later checks
+    with _availability_lock:
+        if version == (_conflict_epoch, _conflict_generations.get(professor_id, 0)):
+            _conflict_index[professor_id] = intervals
+    return intervals
+
+@timed(logger)
+def find_schedule_conflicts(professor_id, day, start_time, end_time, ignore_id=None):
+    """Find a professor's schedules that overlap a proposed time slot
+    
+    Args:
+        professor_id (int): ID of the professor
+        day (str or int): Day name or weekday number (Monday = 0)
+        start_time (str or int): '9:00 AM' or minutes since midnight
+        end_time (str or int): '10:30 AM' or minutes since midnight
+        ignore_id (int, optional): Schedule being edited, not a conflict
         
-        # Create users table
-        cursor.execute('''
-            CREATE TABLE users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                email TEXT NOT NULL,
-                role TEXT NOT NULL
-            )
-        ''')
+    Returns:
+        list: Ids of the overlapping schedules; empty when the slot is free
+            or the times cannot be parsed
+    """
+    try:
+        weekday = parse_weekday(day)
+        start = start_time if isinstance(start_time, int) else parse_time(start_time)
+        end = end_time if isinstance(end_time, int) else parse_time(end_time)
+    except (ValueError, AttributeError, TypeError):
+        return []
         
-        # Create professors table
+    try:
+        intervals = _get_conflict_intervals(professor_id).get(weekday)
+        if intervals is None:
+            return []
+        return intervals.overlapping(start, end, ignore_id)
+    except Exception as e:
+        logger.error("Error checking schedule conflicts: %s", e)
+        return []
+
+def _stored_conflicts(cursor, professor_id, day, start_time, end_time, ignore_id=None):
+    """Ids of stored schedules overlapping a slot, read through cursor
+    
+    Writers call this inside their transaction instead of
+    find_schedule_conflicts(), whose cached intervals may predate a write
+    that committed just before the transaction began.
+    """
+    weekday, start, end = _schedule_numbers(day, start_time, end_time)
+    if None in (weekday, start, end):
+        return []
+    cursor.execute('''
+        SELECT id FROM schedules
+        WHERE professor_id = ? AND weekday = ? AND start_minute < ? AND end_minute > ?
+              AND id IS NOT ?
+    ''', (professor_id, weekday, end, start, ignore_id))
+    return [row[0] for row in cursor.fetchall()]
+
+def _find_list_conflicts(schedules):
+    """Overlapping pairs within a submitted list of schedule dictionaries"""
+    slots = []
+    for position, schedule in enumerate(schedules):
+        weekday, start, end = _schedule_numbers(schedule['day'], schedule['start_time'], schedule['end_time'])
+        if None not in (weekday, start, end):
+            slots.append((weekday, start, end, position))
+    return list(_sweep_overlaps(sorted(slots)))
+
+def _sweep_overlaps(slots):
+    """Yield (first, second) keys of overlapping slots
+    
+    slots must be (group, start, end, key) tuples sorted by group then
+    start; only slots in the same group can overlap.
+    """
+    open_slots = []
+    current_group = None
+    for group, start, end, key in slots:
+        if group != current_group:
+            current_group = group
+            open_slots = []
+        open_slots = [slot for slot in open_slots if slot[0] > start]
+        for _, other_key in open_slots:
+            yield other_key, key
+        open_slots.append((end, key))
+
+@timed(logger)
+def audit_schedule_conflicts():
+    """Report every pair of overlapping schedules in one sorted pass
+    
+    Returns:
+        list: (professor_id, weekday, first_schedule_id, second_schedule_id)
+            for each overlap
+    """
+    try:
+        cursor = get_db_connection().cursor()
+        cursor.row_factory = None
         cursor.execute('''
-            CREATE TABLE professors (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                department TEXT NOT NULL,
-                contact TEXT NOT NULL,
-                email TEXT NOT NULL,
-                picture TEXT
-            )
+            SELECT professor_id, weekday, start_minute, end_minute, id
+            FROM schedules
+            WHERE weekday IS NOT NULL AND start_minute IS NOT NULL AND end_minute IS NOT NULL
+            ORDER BY professor_id, weekday, start_minute
         ''')
+        slots = (((professor_id, weekday), start, end, (professor_id, weekday, schedule_id))
+                 for professor_id, weekday, start, end, schedule_id in cursor)
+        conflicts = [first[:2] + (first[2], second[2])
+                     for first, second in _sweep_overlaps(slots)]
+                     
+        logger.debug("Schedule audit found %s overlaps", len(conflicts))
+        return conflicts
         
-        # Create schedules table
-        cursor.execute('''
-            CREATE TABLE schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                professor_id INTEGER NOT NULL,
-                day TEXT NOT NULL,
-                start_time TEXT NOT NULL,
-                end_time TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                FOREIGN KEY (professor_id) REFERENCES professors (id)
-            )
-        ''')
+    except Exception as e:
+        logger.error("Error auditing schedules: %s", e)
+        return []
+
+@timed(logger)
+def update_professor_by_id(professor_id, name, department, contact=None, email=None, picture=None):
+    """Update professor details
+    
+    One statement keyed on the primary key; it also refuses a name that
+    another professor already has.
+    
+    Args:
+        professor_id (int): ID of professor to update
+        name (str): New name
+        department (str): New department
+        contact (str, optional): New contact number
+        email (str, optional): New email
+        picture (str, optional): New picture path; None keeps the current one
         
-        # Add default admin user
-        cursor.execute(
-            'INSERT INTO users (username, password, email, role) VALUES (?, ?, ?, ?)',
-            ('admin', hashlib.sha256('admin123'.encode()).hexdigest(), 'admin@example.com', 'admin')
-        )
+    Returns:
+        bool: True if professor was updated successfully, False otherwise
+    """
+    conn = None
+    try:
+        if not professor_id or not name or not department:
+            logger.debug("Missing required fields")
+            return False
+            
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE professors 
+            SET name = ?, department = ?, contact = ?, email = ?,
+                picture = COALESCE(?, NULLIF(picture, 'N/A'))
+            WHERE id = ?
+              AND NOT EXISTS (SELECT 1 FROM professors WHERE name = ? AND id != ?)
+        ''', (name, department, contact, email, picture, professor_id, name, professor_id))
+        if cursor.rowcount == 0:
+            conn.rollback()
+            logger.debug("Professor %s not found or name %s already taken", professor_id, name)
+            return False
         
         conn.commit()
-        print("[DEBUG] Database initialized successfully")
+        _invalidate_cache()
+        logger.debug("Updated professor %s", name)
+        return True
         
     except Exception as e:
-        print(f"[DEBUG] Error initializing database: {str(e)}")
+        logger.error("Error updating professor: %s", e)
         if conn:
             conn.rollback()
+        return False
 
-def get_db_connection():
-    """Get a connection to the SQLite database
+@timed(logger)
+def get_professor_schedule(professor_id):
+    """Get schedule for a specific professor
     
+    Args:
+        professor_id (int): ID of the professor
+        
     Returns:
-        sqlite3.Connection: Database connection object
+        list: List of schedule dictionaries
     """
     try:
-        # Ensure data directory exists
-        os.makedirs('data', exist_ok=True)
-        
-        # Set database path
-        db_path = os.path.join('data', 'professor_checker.db')
-        print(f"[DEBUG] Using database at: {db_path}")
-        
-        # Check if database exists
-        db_exists = os.path.exists(db_path)
-        if not db_exists:
-            print("[DEBUG] Database does not exist, will initialize")
-        
-        # Create connection
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        
-        # Enable foreign keys
-        conn.execute('PRAGMA foreign_keys = ON')
-        
-        # Initialize database if it doesn't exist
-        if not db_exists:
-            init_db()
-            
-        return conn
-        
+        return _read_through(('schedule', professor_id), _load_professor_schedule, professor_id)
     except Exception as e:
-        print(f"[DEBUG] Error connecting to database: {str(e)}")
-        return None
+        logger.error("Error getting professor schedule: %s", e)
+        return []
 
-def _upgrade_database(conn, from_version):
-    """Upgrade database schema"""
-    cursor = conn.cursor()
+def _load_professor_schedule(professor_id):
+    """Query the schedules of one professor"""
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = _schedule_row
+    
+    cursor.execute(f'''
+        SELECT {_SCHEDULE_COLUMNS}
+        FROM schedules s
+        JOIN professors p ON s.professor_id = p.id
+        WHERE s.professor_id = ?
+        ORDER BY s.weekday IS NULL, s.weekday, s.start_minute, s.start_time
+    ''', (professor_id,))
+    schedules = cursor.fetchall()
+        
+    logger.debug("Found %s schedules for professor %s", len(schedules), professor_id)
+    return schedules
+
+def _close_connections(connections):
+    """Close connections that are no longer tracked, counting each close"""
+    for conn in connections:
+        try:
+            conn.close()
+            with _connections_lock:
+                _connection_stats['closes'] += 1
+        except Exception as e:
+            logger.error("Error closing database: %s", e)
+
+@timed(logger)
+def close_db():
+    """Close every open database connection
+    
+    Threads that query again afterwards transparently open a new one.
+    """
+    global _connection_generation
+    
+    with _connections_lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+        _connection_generation += 1
+        
+    _close_connections(connections)
+    _local.connection = None
+    if connections:
+        logger.debug("Closed %s database connection(s)", len(connections))
+
+def _slot_key(day, start_time, end_time, subject, numbers):
+    """What identifies a class when diffing: its parsed slot and subject,
+    or its raw text when the day or times cannot be parsed"""
+    if None in numbers:
+        return ('text', day, start_time, end_time, subject)
+    return numbers + (subject,)
+
+@timed(logger)
+def update_professor_schedule(professor_name, schedules, allow_conflicts=False):
+    """Update professor's schedule by name; see update_professor_schedule_by_id"""
+    professor_id = _professor_id(professor_name)
+    if professor_id is None:
+        return False
+    return update_professor_schedule_by_id(professor_id, schedules, allow_conflicts)
+
+@timed(logger)
+def update_professor_schedule_by_id(professor_id, schedules, allow_conflicts=False):
+    """Update professor's schedule
     
+    The submitted list is reconciled with the stored rows: classes that
+    are unchanged are left alone, edited ones are updated in place (so
+    they keep their ids) and only the rest are inserted or deleted, all
+    in one transaction. Caches are only invalidated if something changed.
+    
+    Args:
+        professor_id (int): ID of the professor
+        schedules (list): Schedule dictionaries with day, start_time,
+            end_time and subject
+        allow_conflicts (bool, optional): Save even if slots overlap
+        
+    Returns:
+        bool: True if the schedule was saved, False otherwise
+    """
+    conn = None
     try:
-        if from_version < 2:
-            # Add contact and email columns
-            cursor.execute('ALTER TABLE professors ADD COLUMN contact TEXT')
-            cursor.execute('ALTER TABLE professors ADD COLUMN email TEXT')
-            
-            # Update existing professors with sample data
-            sample_data = {
-                'Dr. Charles Tabares': ('+63 912 345 6789', 'charles.tabares@university.edu'),
-                'Dr. Wensley Naarte': ('+63 923 456 7890', 'wensley.naarte@university.edu'),
-                'Mr. Brian Sarmiento': ('+63 934 567 8901', 'brian.sarmiento@university.edu'),
-                'Dr. Maria Santos': ('+63 945 678 9012', 'maria.santos@university.edu'),
-            }
+        if not allow_conflicts:
+            overlaps = _find_list_conflicts(schedules)
+            if overlaps:
+                logger.debug("Rejected schedule with %s overlapping slot(s)", len(overlaps))
+                return False
+                
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Begin transaction before reading, so the diff is against what we replace
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('SELECT 1 FROM professors WHERE id = ?', (professor_id,))
+        if not cursor.fetchone():
+            conn.rollback()
+            logger.debug("Professor %s not found", professor_id)
+            return False
+        cursor.execute('''
+            SELECT id, day, start_time, end_time, subject, weekday, start_minute, end_minute
+            FROM schedules
+            WHERE professor_id = ?
+            ORDER BY weekday, start_minute, id
+        ''', (professor_id,))
+        stored = {}
+        for row in cursor.fetchall():
+            numbers = (row['weekday'], row['start_minute'], row['end_minute'])
+            key = _slot_key(row['day'], row['start_time'], row['end_time'], row['subject'], numbers)
+            stored.setdefault(key, []).append(row)
             
-            for name, (contact, email) in sample_data.items():
-                cursor.execute('''
-                    UPDATE professors 
-                    SET contact = ?, email = ?
-                    WHERE name = ?
-                ''', (contact, email, name))
-        
-        # Update schema version
-        cursor.execute('UPDATE schema_version SET version = ?', (_SCHEMA_VERSION,))
+        # Classes that are still there keep their row; only a changed
+        # spelling of the day or times ('Mon' for 'Monday') needs an UPDATE
+        updates = []
+        added = []
+        for schedule in schedules:
+            values = (schedule['day'], schedule['start_time'], schedule['end_time'],
+                      schedule.get('subject', 'N/A'))
+            numbers = _schedule_numbers(*values[:3])
+            matches = stored.get(_slot_key(*values, numbers))
+            if matches:
+                row = matches.pop(0)
+                if tuple(row[column] for column in ('day', 'start_time', 'end_time', 'subject')) != values:
+                    updates.append(values + numbers + (row['id'],))
+            else:
+                added.append(values + numbers)
+                
+        # Pair the remaining old and new classes in time order so an edited
+        # class is one UPDATE rather than a DELETE and an INSERT
+        removed = sorted((row for rows in stored.values() for row in rows),
+                         key=lambda row: (row['weekday'] is None, row['weekday'] or 0,
+                                          row['start_minute'] or 0, row['id']))
+        added.sort(key=lambda values: (values[4] is None, values[4] or 0, values[5] or 0))
+        reused = min(len(removed), len(added))
+        updates.extend(new + (old['id'],) for old, new in zip(removed, added))
+        deletes = [(row['id'],) for row in removed[reused:]]
+        inserts = [(professor_id,) + new for new in added[reused:]]
+        
+        if deletes:
+            cursor.executemany('DELETE FROM schedules WHERE id = ?', deletes)
+        if updates:
+            cursor.executemany('''
+                UPDATE schedules
+                SET day = ?, start_time = ?, end_time = ?, subject = ?,
+                    weekday = ?, start_minute = ?, end_minute = ?
+                WHERE id = ?
+            ''', updates)
+        if inserts:
+            cursor.executemany('''
+                INSERT INTO schedules (professor_id, day, start_time, end_time, subject,
+                                       weekday, start_minute, end_minute)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', inserts)
+        
+        # Commit transaction
         conn.commit()
-        print("[DEBUG] Database upgrade completed successfully")
+        logger.debug("Schedule of professor %s saved: %s inserted, %s updated, %s deleted",
+                     professor_id, len(inserts), len(updates), len(deletes))
+        if inserts or updates or deletes:
+            _invalidate_cache()
+            _mark_schedules_changed([professor_id])
+        return True
         
     except Exception as e:
-        print(f"[DEBUG] Error upgrading database: {str(e)}")
-        conn.rollback()
-        raise
+        logger.error("Error updating schedule: %s", e)
+        if conn:
+            conn.rollback()
+        return False
 
-def get_all_professors():
-    """Get all professors from database"""
+@timed(logger)
+def verify_user(username, password):
+    """Verify user credentials
+    
+    A correct password stored as a legacy SHA-256 digest, or hashed with
+    weaker settings than the current ones, is re-hashed in place. This
+    runs a deliberately slow KDF, so UI code should call it off the Tk
+    thread.
+    
+    Returns:
+        tuple: (True, role) if the credentials match, else (False, None)
+    """
+    conn = None
     try:
-        print("[DEBUG] Attempting to get database connection")
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        print("[DEBUG] Executing SELECT query on professors table")
-        try:
-            cursor.execute('SELECT * FROM professors ORDER BY name')
-            professors = cursor.fetchall()
-            
-            if not professors:
-                print("[DEBUG] No professors found in database")
-                # Initialize database if empty
-                init_db()
-                cursor.execute('SELECT * FROM professors ORDER BY name')
-                professors = cursor.fetchall()
+        cursor.execute('SELECT id, role, password FROM users WHERE username = ?', (username,))
+        row = cursor.fetchone()
+        if not row or not passwords.verify_password(password, row['password']):
+            return False, None
             
-            result = []
-            for row in professors:  # Use professors instead of cursor.fetchall()
-                prof_data = {
-                    'id': row['id'] if 'id' in row.keys() else None,
-                    'name': row['name'] if 'name' in row.keys() else 'N/A',
-                    'department': row['department'] if 'department' in row.keys() else 'N/A',
-                    'contact': row['contact'] if 'contact' in row.keys() else 'N/A',
-                    'email': row['email'] if 'email' in row.keys() else 'N/A',
-                    'picture': row['picture'] if 'picture' in row.keys() else None
-                }
-                result.append(prof_data)
-                
-            print(f"[DEBUG] Found {len(result)} professors")
-            return result
+        if passwords.needs_rehash(row['password']):
+            cursor.execute('UPDATE users SET password = ? WHERE id = ?',
+                           (passwords.hash_password(password), row['id']))
+            conn.commit()
+            logger.debug("Upgraded password hash for %s", username)
+        return True, row['role']
+        
+    except Exception as e:
+        logger.error("Error verifying user: %s", e)
+        if conn:
+            conn.rollback()
+        return False, None
+
+@timed(logger)
+def get_all_users():
+    """Get all users from database
+    
+    Returns:
+        list: UserRecord (id, username, email, role) for each user
+    """
+    try:
+        logger.debug("Getting all users from database")
+        users = list(iter_users())
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for user in users:
+                logger.debug("Found user: %s (%s)", user.username, user.email)
             
-        except sqlite3.OperationalError as e:
-            if "no such table" in str(e).lower():
-                print("[DEBUG] Professors table not found, initializing database")
-                init_db()
-                # Try again after initialization
-                cursor.execute('SELECT * FROM professors ORDER BY name')
-                professors = cursor.fetchall()
-                return [dict(prof) for prof in professors]
-            raise
+        logger.debug("Total users found: %s", len(users))
+        return users
             
     except Exception as e:
-        print(f"[DEBUG] Error getting professors: {str(e)}")
+        logger.error("Error getting users: %s", e)
         return []
 
-def get_professor_by_name(name):
-    """Get professor details by name"""
+@timed(logger)
+def get_user_by_id(user_id):
+    """Get a user by primary key
+    
+    Returns:
+        UserRecord: The user, or None if not found or on error
+    """
+    try:
+        cursor = get_db_connection().cursor()
+        cursor.row_factory = _user_row
+        cursor.execute(f'SELECT {_USER_COLUMNS} FROM users WHERE id = ?', (user_id,))
+        return cursor.fetchone()
+    except Exception as e:
+        logger.error("Error getting user: %s", e)
+        return None
+
+@timed(logger)
+def get_users_page(after=None, limit=100, sort='username'):
+    """Get one page of users without reading the rest of the table
+    
+    Args:
+        after (tuple, optional): Cursor returned with the previous page;
+            None starts from the beginning
+        limit (int, optional): Maximum number of users on the page
+        sort (str, optional): 'username' or 'role'
+        
+    Returns:
+        tuple: (list of UserRecord, cursor for the next page or None)
+        
+    Raises:
+        ValueError: If sort is not a supported column
+    """
+    if sort not in _USER_SORT_KEYS:
+        raise ValueError(f"Cannot sort users by {sort}")
+    try:
+        cursor = get_db_connection().cursor()
+        cursor.row_factory = _user_row
+        return _load_page(cursor, 'users', _USER_COLUMNS, sort, after, limit)
+    except Exception as e:
+        logger.error("Error getting users page: %s", e)
+        return [], None
+
+@timed(logger)
+def add_user(username, password, email, role):
+    """Add a new user
+    
+    Args:
+        username (str): Username
+        password (str): Password to hash and store
+        email (str): User's email address
+        role (str): User's role (admin/student)
+        
+    Returns:
+        bool: True if user was added successfully, False otherwise
+    """
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM professors WHERE name = ?', (name,))
-        row = cursor.fetchone()
+        # Check if username already exists
+        cursor.execute('SELECT username FROM users WHERE username = ?', (username,))
+        if cursor.fetchone():
+            logger.debug("Username %s already exists", username)
+            return False
         
-        if row:
-            # Convert sqlite3.Row to dictionary
-            return {
-                'id': row['id'],
-                'name': row['name'],
-                'department': row['department'] if 'department' in row.keys() else 'N/A',
-                'contact': row['contact'] if 'contact' in row.keys() else 'N/A',
-                'email': row['email'] if 'email' in row.keys() else 'N/A',
-                'picture': row['picture'] if 'picture' in row.keys() else None
-            }
-        return None
+        hashed_password = passwords.hash_password(password)
+        
+        cursor.execute('''
+            INSERT INTO users (username, password, email, role)
+            VALUES (?, ?, ?, ?)
+        ''', (username, hashed_password, email, role))
+        
+        conn.commit()
+        logger.debug("Added new user: %s", username)
+        return True
         
     except Exception as e:
-        print(f"[DEBUG] Error getting professor: {str(e)}")
-        return None
+        logger.error("Error adding user: %s", e)
+        if conn:
+            conn.rollback()
+        return False
 
-def update_professor(professor_id, name, department, contact=None, email=None):
-    """Update professor details
+@timed(logger)
+def bulk_add_users(users, processes=None):
+    """Add many users at once, hashing their passwords in parallel
+    
+    Usernames that already exist (or repeat within users) are skipped.
     
     Args:
-        professor_id (int): ID of professor to update
-        name (str): New name
-        department (str): New department
-        contact (str, optional): New contact number
-        email (str, optional): New email
+        users (iterable): (username, password, email, role) tuples
+        processes (int, optional): Hashing pool size; None uses every CPU
+            and 0 hashes in this process
         
     Returns:
-        bool: True if professor was updated successfully, False otherwise
+        int: Number of users added, or None on a database error
     """
+    conn = None
     try:
-        if not professor_id or not name or not department:
-            print("[DEBUG] Missing required fields")
-            return False
-            
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            UPDATE professors 
-            SET name = ?, department = ?, contact = ?, email = ?
-            WHERE id = ?
-        ''', (name, department, contact, email, professor_id))
+        cursor.execute('SELECT username FROM users')
+        taken = {row[0] for row in cursor.fetchall()}
+        new_users = []
+        for username, password, email, role in users:
+            if username not in taken:
+                taken.add(username)
+                new_users.append((username, password, email, role))
+                
+        hashes = passwords.hash_passwords([user[1] for user in new_users], processes)
+        cursor.execute('BEGIN')
+        cursor.executemany(
+            'INSERT INTO users (username, password, email, role) VALUES (?, ?, ?, ?)',
+            ((username, hashed, email, role)
+             for (username, _, email, role), hashed in zip(new_users, hashes))
+        )
+        conn.commit()
+        logger.debug("Added %s users in bulk", len(new_users))
+        return len(new_users)
+        
+    except Exception as e:
+        logger.error("Error adding users: %s", e)
+        if conn:
+            conn.rollback()
+        return None
+
+@timed(logger)
+def delete_user(username):
+    """Delete a user
+    
+    Returns:
+        bool: True if the user existed and was deleted, False otherwise
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM users WHERE username = ?', (username,))
         
         conn.commit()
-        print(f"[DEBUG] Updated professor {name}")
+        if cursor.rowcount == 0:
+            logger.debug("User %s not found", username)
+            return False
+        logger.debug("Deleted user: %s", username)
         return True
         
     except Exception as e:
-        print(f"[DEBUG] Error updating professor: {str(e)}")
+        logger.error("Error deleting user: %s", e)
         if conn:
             conn.rollback()
         return False
 
-def get_professor_schedule(professor_id):
-    """Get schedule for a specific professor
+@timed(logger)
+def delete_user_by_id(user_id):
+    """Delete a user by primary key
     
-    Args:
-        professor_id (int): ID of the professor
-        
     Returns:
-        list: List of schedule dictionaries
+        bool: True if the user existed and was deleted, False otherwise
     """
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT s.*, p.name as professor_name 
-            FROM schedules s
-            JOIN professors p ON s.professor_id = p.id
-            WHERE s.professor_id = ?
-            ORDER BY s.day, s.start_time
-        ''', (professor_id,))
+        cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
         
-        schedules = []
-        for row in cursor.fetchall():
-            schedule = {
-                'id': row['id'],
-                'professor_id': row['professor_id'],
-                'professor_name': row['professor_name'],
-                'day': row['day'],
-                'start_time': row['start_time'],
-                'end_time': row['end_time'],
-                'subject': row['subject']
-            }
-            schedules.append(schedule)
-            
-        print(f"[DEBUG] Found {len(schedules)} schedules for professor {professor_id}")
-        return schedules
+        conn.commit()
+        if cursor.rowcount == 0:
+            logger.debug("User %s not found", user_id)
+            return False
+        logger.debug("Deleted user: %s", user_id)
+        return True
         
     except Exception as e:
-        print(f"[DEBUG] Error getting professor schedule: {str(e)}")
-        return []
+        logger.error("Error deleting user: %s", e)
+        if conn:
+            conn.rollback()
+        return False
 
-def close_db():
-    """Close the database connection"""
-    try:
-        if _db_connection:
-            _db_connection.close()
-            print("[DEBUG] Database connection closed")
-            
-    except Exception as e:
-        print(f"[DEBUG] Error closing database: {str(e)}")
+def _token_hash(token):
+    """Sessions store a SHA-256 of the token, never the token itself"""
+    return hashlib.sha256(token.encode()).hexdigest()
 
-def update_professor_schedule(professor_name, schedules):
-    """Update professor's schedule"""
+@timed(logger)
+def create_session(username, ttl_days=30, replaces=None):
+    """Start a remember-me session for a user
+    
+    Args:
+        username (str): User to remember
+        ttl_days (int, optional): Days until the session expires
+        replaces (str, optional): The client's previous token, revoked in
+            the same transaction so it stops working straight away
+        
+    Returns:
+        str: Random token to keep on the client, or None on error
+    """
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get professor ID
-        cursor.execute('SELECT id FROM professors WHERE name = ?', (professor_name,))
-        prof_row = cursor.fetchone()
-        
-        if not prof_row:
-            print(f"[DEBUG] Professor {professor_name} not found")
-            return False
+        cursor.execute('SELECT id FROM users WHERE username = ?', (username,))
+        row = cursor.fetchone()
+        if not row:
+            logger.debug("User %s not found", username)
+            return None
             
-        # Begin transaction
-        cursor.execute('BEGIN TRANSACTION')
-        
-        # Delete existing schedules
-        cursor.execute('DELETE FROM schedules WHERE professor_id = ?', (prof_row['id'],))
-        
-        # Insert new schedules
-        for schedule in schedules:
-            cursor.execute('''
-                INSERT INTO schedules (professor_id, day, start_time, end_time, subject)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                prof_row['id'],
-                schedule['day'],
-                schedule['start_time'],
-                schedule['end_time'],
-                schedule.get('subject', 'N/A')
-            ))
-        
-        # Commit transaction
+        if replaces:
+            cursor.execute('DELETE FROM sessions WHERE token_hash = ?', (_token_hash(replaces),))
+        token = secrets.token_urlsafe(32)
+        now = int(time.time())
+        cursor.execute('''
+            INSERT INTO sessions (token_hash, user_id, created_at, expires_at)
+            VALUES (?, ?, ?, ?)
+        ''', (_token_hash(token), row['id'], now, now + int(ttl_days * 86400)))
         conn.commit()
-        return True
+        logger.debug("Created session for %s", username)
+        return token
         
     except Exception as e:
-        print(f"[DEBUG] Error updating schedule: {str(e)}")
-        conn.rollback()
-        return False
+        logger.error("Error creating session: %s", e)
+        if conn:
+            conn.rollback()
+        return None
 
-def verify_user(username, password):
-    """Verify user credentials"""
+@timed(logger)
+def resume_session(token):
+    """Look up the user behind a remember-me token
+    
+    This is a single indexed query; no password hashing is involved.
+    
+    Returns:
+        tuple: (username, role) for a live session, else (None, None)
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Hash the provided password
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        
-        # Check credentials
-        cursor.execute(
-            'SELECT role FROM users WHERE username = ? AND password = ?',
-            (username, hashed_password)
-        )
-        
+        cursor = get_db_connection().cursor()
+        cursor.execute('''
+            SELECT u.username, u.role
+            FROM sessions s
+            JOIN users u ON u.id = s.user_id
+            WHERE s.token_hash = ? AND s.expires_at > ?
+        ''', (_token_hash(token), int(time.time())))
         row = cursor.fetchone()
         if row:
-            return True, row['role']
-        return False, None
+            return row['username'], row['role']
+        return None, None
         
     except Exception as e:
-        print(f"[DEBUG] Error verifying user: {str(e)}")
-        return False, None
+        logger.error("Error resuming session: %s", e)
+        return None, None
 
-def get_all_users():
-    """Get all users from database
+@timed(logger)
+def end_session(token):
+    """Delete a remember-me session
     
     Returns:
-        list: List of user dictionaries containing id, username, email, and role
+        bool: True if the session existed, False otherwise
     """
+    conn = None
     try:
         conn = get_db_connection()
-        if not conn:
-            print("[DEBUG] Failed to get database connection")
-            return []
-            
         cursor = conn.cursor()
-        print("[DEBUG] Getting all users from database")
+        cursor.execute('DELETE FROM sessions WHERE token_hash = ?', (_token_hash(token),))
+        conn.commit()
+        return cursor.rowcount > 0
         
-        try:
-            cursor.execute('''
-                SELECT id, username, email, role 
-                FROM users 
-                ORDER BY username
-            ''')
-            
-            users = []
-            for row in cursor.fetchall():
-                user = {
-                    'id': row['id'],
-                    'username': row['username'],
-                    'email': row['email'],
-                    'role': row['role']
-                }
-                users.append(user)
-                print(f"[DEBUG] Found user: {user['username']} ({user['email']})")
-                
-            print(f"[DEBUG] Total users found: {len(users)}")
-            return users
-            
-        except sqlite3.OperationalError as e:
-            if "no such table" in str(e).lower() or "no such column" in str(e).lower():
-                print("[DEBUG] Users table needs initialization")
-                init_db()
-                # Try again after initialization
-                cursor.execute('''
-                    SELECT id, username, email, role 
-                    FROM users 
-                    ORDER BY username
-                ''')
-                
-                users = []
-                for row in cursor.fetchall():
-                    user = {
-                        'id': row['id'],
-                        'username': row['username'],
-                        'email': row['email'],
-                        'role': row['role']
-                    }
-                    users.append(user)
-                    print(f"[DEBUG] Found user: {user['username']} ({user['email']})")
-                    
-                print(f"[DEBUG] Total users found after init: {len(users)}")
-                return users
-            else:
-                raise
-            
     except Exception as e:
-        print(f"[DEBUG] Error getting users: {str(e)}")
-        return []
+        logger.error("Error ending session: %s", e)
+        if conn:
+            conn.rollback()
+        return False
 
-def add_user(username, password, email, role):
-    """Add a new user
+@timed(logger)
+def purge_expired_sessions(batch_size=500):
+    """Delete expired sessions a batch per transaction
+    
+    Small batches keep each write lock short, so a large backlog does not
+    hold up logins running at the same time.
     
     Args:
-        username (str): Username
-        password (str): Password to hash and store
-        email (str): User's email address
-        role (str): User's role (admin/student)
+        batch_size (int, optional): Sessions deleted per transaction
         
     Returns:
-        bool: True if user was added successfully, False otherwise
+        int: Number of sessions deleted
     """
+    conn = None
+    deleted = 0
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        # Check if username already exists
-        cursor.execute('SELECT username FROM users WHERE username = ?', (username,))
-        if cursor.fetchone():
-            print(f"[DEBUG] Username {username} already exists")
-            return False
-        
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        
-        cursor.execute('''
-            INSERT INTO users (username, password, email, role)
-            VALUES (?, ?, ?, ?)
-        ''', (username, hashed_password, email, role))
-        
-        conn.commit()
-        print(f"[DEBUG] Added new user: {username}")
-        return True
+        now = int(time.time())
+        while True:
+            cursor.execute('''
+                DELETE FROM sessions WHERE id IN (
+                    SELECT id FROM sessions WHERE expires_at <= ? LIMIT ?
+                )
+            ''', (now, batch_size))
+            conn.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+        if deleted:
+            logger.debug("Purged %s expired sessions", deleted)
+        return deleted
         
     except Exception as e:
-        print(f"[DEBUG] Error adding user: {str(e)}")
+        logger.error("Error purging sessions: %s", e)
         if conn:
             conn.rollback()
-        return False
+        return deleted
 
-def delete_user(username):
-    """Delete a user"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM users WHERE username = ?', (username,))
-        
-        conn.commit()
-        print(f"[DEBUG] Deleted user: {username}")
-        return True
-        
-    except Exception as e:
-        print(f"[DEBUG] Error deleting user: {str(e)}")
+@timed(logger)
+def update_professor_picture(professor_name, picture_path):
+    """Update professor's picture by name; see update_professor_picture_by_id"""
+    professor_id = _professor_id(professor_name)
+    if professor_id is None:
         return False
+    return update_professor_picture_by_id(professor_id, picture_path)
 
-def update_professor_picture(professor_name, picture_path):
-    """Update professor's picture"""
+@timed(logger)
+def update_professor_picture_by_id(professor_id, picture_path):
+    """Update professor's picture
+    
+    Returns:
+        bool: True if the professor exists and was updated, False otherwise
+    """
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -516,19 +2245,26 @@ def update_professor_picture(professor_name, picture_path):
         cursor.execute('''
             UPDATE professors 
             SET picture = ?
-            WHERE name = ?
-        ''', (picture_path, professor_name))
+            WHERE id = ?
+        ''', (picture_path, professor_id))
         
         conn.commit()
-        print(f"[DEBUG] Updated picture for professor: {professor_name}")
+        if cursor.rowcount == 0:
+            logger.debug("Professor %s not found", professor_id)
+            return False
+        _invalidate_cache()
+        logger.debug("Updated picture for professor: %s", professor_id)
         return True
         
     except Exception as e:
-        print(f"[DEBUG] Error updating professor picture: {str(e)}")
+        logger.error("Error updating professor picture: %s", e)
+        if conn:
+            conn.rollback()
         return False
 
+@timed(logger)
 def update_professor(old_name, new_name, department, contact, email, picture=None):
-    """Update professor information
+    """Update professor information by name
     
     Args:
         old_name (str): Current name of the professor
@@ -541,104 +2277,71 @@ def update_professor(old_name, new_name, department, contact, email, picture=Non
     Returns:
         bool: True if update was successful, False otherwise
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # First check if the professor exists
-        cursor.execute('SELECT picture FROM professors WHERE name = ?', (old_name,))
-        result = cursor.fetchone()
-        if not result:
-            print(f"Professor {old_name} not found")
-            return False
-                
-        # If we're changing the name, check if the new name already exists
-        if old_name != new_name:
-            cursor.execute('SELECT 1 FROM professors WHERE name = ?', (new_name,))
-            if cursor.fetchone():
-                print(f"Professor {new_name} already exists")
-                return False
-            
-        # Get current picture path
-        current_picture = result[0] if result[0] != "N/A" else None
-        
-        # If no new picture provided, keep the current one
-        picture_path = picture if picture is not None else current_picture
-        
-        # Update professor information
-        if old_name == new_name:
-            # If name isn't changing, simple update
-            cursor.execute('''
-                UPDATE professors 
-                SET department = ?, contact = ?, email = ?, picture = ?
-                WHERE name = ?
-            ''', (department, contact, email, picture_path, old_name))
-        else:
-            # If name is changing, we need to update schedules as well
-            cursor.execute('''
-                UPDATE professors 
-                SET name = ?, department = ?, contact = ?, email = ?, picture = ?
-                WHERE name = ?
-            ''', (new_name, department, contact, email, picture_path, old_name))
-            
-            # Update related schedules
-            cursor.execute('UPDATE schedules SET professor_id = (SELECT id FROM professors WHERE name = ?) WHERE professor_id = (SELECT id FROM professors WHERE name = ?)',
-                         (new_name, old_name))
-        
-        conn.commit()
-        if conn.total_changes > 0:
-            return True
-        else:
-            print("No changes made to professor record")
-            return False
-                
-    except Exception as e:
-        print(f"Error updating professor: {e}")
+    professor_id = _professor_id(old_name)
+    if professor_id is None:
         return False
+    return update_professor_by_id(professor_id, new_name, department, contact, email, picture)
 
+@timed(logger)
 def delete_professor(name):
+    """Delete a professor by name; see delete_professor_by_id"""
+    professor_id = _professor_id(name)
+    if professor_id is None:
+        return False
+    return delete_professor_by_id(professor_id)
+
+@timed(logger)
+def delete_professor_by_id(professor_id):
     """Delete a professor and all associated schedules
     
     Args:
-        name (str): Name of the professor to delete
+        professor_id (int): ID of the professor to delete
         
     Returns:
         bool: True if professor was deleted successfully, False otherwise
     """
+    return delete_professors([professor_id]) == 1
+
+@timed(logger)
+def delete_professors(professor_ids):
+    """Delete any number of professors and their schedules
+    
+    One DELETE statement in one transaction; the schedules go with their
+    professor through ON DELETE CASCADE (migration 8).
+    
+    Args:
+        professor_ids (iterable): IDs of the professors to delete
+        
+    Returns:
+        int: Number of professors deleted, or 0 on error
+    """
     conn = None
     try:
+        professor_ids = list(professor_ids)
+        if not professor_ids:
+            return 0
+            
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Start transaction
-        conn.execute('BEGIN TRANSACTION')
-        
-        # Get professor ID first
-        cursor.execute('SELECT id FROM professors WHERE name = ?', (name,))
-        prof = cursor.fetchone()
-        if not prof:
-            print(f"[DEBUG] Professor {name} not found")
-            return False
-            
-        prof_id = prof['id']
-        
-        # Delete associated schedules first
-        cursor.execute('DELETE FROM schedules WHERE professor_id = ?', (prof_id,))
-        
-        # Then delete the professor
-        cursor.execute('DELETE FROM professors WHERE id = ?', (prof_id,))
-        
-        # Commit transaction
+        cursor.execute('DELETE FROM professors WHERE id IN (SELECT value FROM json_each(?))',
+                       (json.dumps(professor_ids),))
+        deleted = cursor.rowcount
         conn.commit()
-        print(f"[DEBUG] Successfully deleted professor {name} and their schedules")
-        return True
+        
+        if deleted:
+            _invalidate_cache()
+            _mark_schedules_changed(professor_ids)
+        logger.debug("Deleted %s professors and their schedules", deleted)
+        return deleted
         
     except Exception as e:
-        print(f"[DEBUG] Error deleting professor: {str(e)}")
+        logger.error("Error deleting professors: %s", e)
         if conn:
             conn.rollback()
-        return False
+        return 0
 
+@timed(logger)
 def add_professor(name, department, contact=None, email=None, picture=None):
     """Add a new professor
     
@@ -652,9 +2355,10 @@ def add_professor(name, department, contact=None, email=None, picture=None):
     Returns:
         bool: True if professor was added successfully, False otherwise
     """
+    conn = None
     try:
         if not name or not department:
-            print("[DEBUG] Missing required fields")
+            logger.debug("Missing required fields")
             return False
             
         conn = get_db_connection()
@@ -663,7 +2367,7 @@ def add_professor(name, department, contact=None, email=None, picture=None):
         # Check if professor already exists
         cursor.execute('SELECT name FROM professors WHERE name = ?', (name,))
         if cursor.fetchone():
-            print(f"[DEBUG] Professor {name} already exists")
+            logger.debug("Professor %s already exists", name)
             return False
             
         # Insert professor
@@ -673,16 +2377,87 @@ def add_professor(name, department, contact=None, email=None, picture=None):
         ''', (name, department, contact, email, picture))
         
         conn.commit()
-        print(f"[DEBUG] Added new professor: {name} from {department}")
+        _invalidate_cache()
+        _mark_schedules_changed([cursor.lastrowid])
+        logger.debug("Added new professor: %s from %s", name, department)
         return True
         
     except Exception as e:
-        print(f"[DEBUG] Error adding professor: {str(e)}")
+        logger.error("Error adding professor: %s", e)
         if conn:
             conn.rollback()
         return False
 
-def add_schedule(professor_id, day, start_time, end_time, subject):
+@timed(logger)
+def bulk_add_professors(rows):
+    """Add many professors in one transaction
+    
+    Rows are checked in memory first; names already in the database are
+    found with a single query against the name index. Bad rows are
+    reported and skipped, the rest are inserted with executemany.
+    
+    Args:
+        rows (iterable): Dictionaries with name and department, and
+            optionally contact, email and picture
+        
+    Returns:
+        tuple: (number added, list of (row index, error message))
+    """
+    errors = []
+    accepted = []
+    seen = set()
+    for index, row in enumerate(rows):
+        name = (row.get('name') or '').strip()
+        department = (row.get('department') or '').strip()
+        if not name or not department:
+            errors.append((index, "Name and department are required"))
+        elif name in seen:
+            errors.append((index, f"Duplicate professor {name} in this batch"))
+        else:
+            seen.add(name)
+            # Blank contact details are stored as '' like the add dialog does
+            accepted.append((index, (name, department, (row.get('contact') or '').strip(),
+                                     (row.get('email') or '').strip(), row.get('picture') or None)))
+            
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        
+        cursor.execute('SELECT name FROM professors WHERE name IN (SELECT value FROM json_each(?))',
+                       (json.dumps([values[0] for _, values in accepted]),))
+        existing = {row[0] for row in cursor.fetchall()}
+        new_rows = []
+        for index, values in accepted:
+            if values[0] in existing:
+                errors.append((index, f"Professor {values[0]} already exists"))
+            else:
+                new_rows.append(values)
+                
+        last_id = cursor.execute('SELECT COALESCE(MAX(id), 0) FROM professors').fetchone()[0]
+        cursor.executemany('''
+            INSERT INTO professors (name, department, contact, email, picture)
+            VALUES (?, ?, ?, ?, ?)
+        ''', new_rows)
+        cursor.execute('SELECT id FROM professors WHERE id > ?', (last_id,))
+        new_ids = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+        
+        _invalidate_cache()
+        _mark_schedules_changed(new_ids)
+        errors.sort()
+        logger.debug("Added %s professors in bulk, %s rows rejected", len(new_rows), len(errors))
+        return len(new_rows), errors
+        
+    except Exception as e:
+        logger.error("Error adding professors: %s", e)
+        if conn:
+            conn.rollback()
+        return 0, [(None, f"Database error: {e}")]
+
+@timed(logger)
+def add_schedule(professor_id, day, start_time, end_time, subject, allow_conflicts=False):
     """Add a new schedule for a professor
     
     Args:
@@ -691,34 +2466,156 @@ def add_schedule(professor_id, day, start_time, end_time, subject):
         start_time (str): Start time in HH:MM format
         end_time (str): End time in HH:MM format
         subject (str): Subject name
+        allow_conflicts (bool, optional): Add even if it overlaps another class
         
     Returns:
         bool: True if schedule was added successfully, False otherwise
     """
+    conn = None
     try:
         if not all([professor_id, day, start_time, end_time, subject]):
-            print("[DEBUG] Missing required fields")
+            logger.debug("Missing required fields")
             return False
             
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        # Check and insert in one write transaction so two callers cannot
+        # both pass the check and double-book the slot
+        cursor.execute('BEGIN IMMEDIATE')
+        if not allow_conflicts and _stored_conflicts(cursor, professor_id, day, start_time, end_time):
+            conn.rollback()
+            logger.debug("Schedule for professor %s on %s overlaps another class", professor_id, day)
+            return False
+            
         # Add the schedule
         cursor.execute('''
-            INSERT INTO schedules (professor_id, day, start_time, end_time, subject)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (professor_id, day, start_time, end_time, subject))
+            INSERT INTO schedules (professor_id, day, start_time, end_time, subject,
+                                   weekday, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (professor_id, day, start_time, end_time, subject)
+             + _schedule_numbers(day, start_time, end_time))
         
         conn.commit()
-        print(f"[DEBUG] Added schedule for professor {professor_id} on {day}")
+        _invalidate_cache()
+        _mark_schedules_changed([professor_id])
+        logger.debug("Added schedule for professor %s on %s", professor_id, day)
         return True
         
     except Exception as e:
-        print(f"[DEBUG] Error adding schedule: {str(e)}")
+        logger.error("Error adding schedule: %s", e)
         if conn:
             conn.rollback()
         return False
 
+@timed(logger)
+def bulk_add_schedules(rows, allow_conflicts=False):
+    """Add many schedules in one transaction
+    
+    Professors are resolved with a single query, and each row is checked
+    against the professor's existing classes that day and the rows
+    accepted before it. Bad rows are reported and skipped, the rest are inserted with
+    executemany.
+    
+    Args:
+        rows (iterable): Dictionaries with day, start_time, end_time and
+            subject, plus either professor_id or professor (the name)
+        allow_conflicts (bool, optional): Accept rows that overlap
+            another class
+        
+    Returns:
+        tuple: (number added, list of (row index, error message))
+    """
+    errors = []
+    parsed = []
+    for index, row in enumerate(rows):
+        professor = row.get('professor_id') or (row.get('professor') or '').strip()
+        if not all([professor, row.get('day'), row.get('start_time'),
+                    row.get('end_time'), row.get('subject')]):
+            errors.append((index, "Professor, day, start time, end time and subject are required"))
+            continue
+        numbers = _schedule_numbers(row['day'], row['start_time'], row['end_time'])
+        if None in numbers:
+            errors.append((index, "Unrecognized day or time"))
+        elif numbers[1] >= numbers[2]:
+            errors.append((index, "End time must be after start time"))
+        else:
+            parsed.append((index, professor, row, numbers))
+            
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        
+        # Resolve names and check ids in one query
+        names = [professor for _, professor, _, _ in parsed if isinstance(professor, str)]
+        ids = [professor for _, professor, _, _ in parsed if not isinstance(professor, str)]
+        cursor.execute('''
+            SELECT id, name FROM professors
+            WHERE name IN (SELECT value FROM json_each(?))
+               OR id IN (SELECT value FROM json_each(?))
+        ''', (json.dumps(names), json.dumps(ids)))
+        known = {}
+        for professor_id, name in cursor.fetchall():
+            known[name] = professor_id
+            known[professor_id] = professor_id
+            
+        resolved = []
+        for index, professor, row, numbers in parsed:
+            if professor not in known:
+                errors.append((index, f"Professor {professor} not found"))
+            else:
+                resolved.append((index, known[professor], row, numbers))
+                
+        # Existing classes on the (professor, weekday) pairs of the batch, one
+        # query driven by idx_schedules_professor_weekday_start
+        intervals = {}
+        if not allow_conflicts:
+            pairs = {(professor_id, numbers[0]) for _, professor_id, _, numbers in resolved}
+            for pair in pairs:
+                intervals[pair] = _IntervalList()
+            cursor.execute('''
+                SELECT s.id, s.professor_id, s.weekday, s.start_minute, s.end_minute
+                FROM json_each(?) AS pair
+                JOIN schedules s ON s.professor_id = json_extract(pair.value, '$[0]')
+                                AND s.weekday = json_extract(pair.value, '$[1]')
+                WHERE s.start_minute IS NOT NULL AND s.end_minute IS NOT NULL
+            ''', (json.dumps(sorted(pairs)),))
+            for schedule_id, professor_id, weekday, start, end in cursor.fetchall():
+                intervals[professor_id, weekday].add(start, end, schedule_id)
+                
+        new_rows = []
+        for index, professor_id, row, (weekday, start, end) in resolved:
+            if not allow_conflicts:
+                slot = intervals[professor_id, weekday]
+                if slot.overlapping(start, end):
+                    errors.append((index, "Overlaps another class of this professor"))
+                    continue
+                slot.add(start, end, -1 - index)  # Negative ids stand for rows of this batch
+            new_rows.append((professor_id, row['day'], row['start_time'], row['end_time'],
+                             row['subject'], weekday, start, end))
+            
+        cursor.executemany('''
+            INSERT INTO schedules (professor_id, day, start_time, end_time, subject,
+                                   weekday, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', new_rows)
+        conn.commit()
+        
+        _invalidate_cache()
+        _mark_schedules_changed({values[0] for values in new_rows})
+        errors.sort()
+        logger.debug("Added %s schedules in bulk, %s rows rejected", len(new_rows), len(errors))
+        return len(new_rows), errors
+        
+    except Exception as e:
+        logger.error("Error adding schedules: %s", e)
+        if conn:
+            conn.rollback()
+        return 0, [(None, f"Database error: {e}")]
+
+@timed(logger)
 def delete_schedule(schedule_id):
     """Delete a schedule
     
@@ -728,26 +2625,36 @@ def delete_schedule(schedule_id):
     Returns:
         bool: True if schedule was deleted successfully, False otherwise
     """
+    conn = None
     try:
         if not schedule_id:
-            print("[DEBUG] Missing schedule ID")
+            logger.debug("Missing schedule ID")
             return False
             
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        cursor.execute('SELECT professor_id FROM schedules WHERE id = ?', (schedule_id,))
+        owner = cursor.fetchone()
+        if not owner:
+            logger.debug("Schedule %s not found", schedule_id)
+            return False
+        
         cursor.execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
         conn.commit()
+        _invalidate_cache()
+        _mark_schedules_changed([owner['professor_id']])
         
-        print(f"[DEBUG] Deleted schedule {schedule_id}")
+        logger.debug("Deleted schedule %s", schedule_id)
         return True
         
     except Exception as e:
-        print(f"[DEBUG] Error deleting schedule: {str(e)}")
+        logger.error("Error deleting schedule: %s", e)
         if conn:
             conn.rollback()
         return False
 
+@timed(logger)
 def get_schedules_by_day(day=None):
     """Get all schedules for a specific day or all days
     
@@ -758,45 +2665,54 @@ def get_schedules_by_day(day=None):
         list: List of schedule dictionaries
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        if day:
-            cursor.execute('''
-                SELECT s.*, p.name as professor_name 
-                FROM schedules s
-                JOIN professors p ON s.professor_id = p.id
-                WHERE s.day = ?
-                ORDER BY s.start_time
-            ''', (day,))
-        else:
-            cursor.execute('''
-                SELECT s.*, p.name as professor_name 
-                FROM schedules s
-                JOIN professors p ON s.professor_id = p.id
-                ORDER BY s.day, s.start_time
-            ''')
-            
-        schedules = []
-        for row in cursor.fetchall():
-            schedule = {
-                'id': row['id'],
-                'professor_id': row['professor_id'],
-                'professor_name': row['professor_name'],
-                'day': row['day'],
-                'start_time': row['start_time'],
-                'end_time': row['end_time'],
-                'subject': row['subject']
-            }
-            schedules.append(schedule)
-            
-        print(f"[DEBUG] Found {len(schedules)} schedules for day: {day if day else 'all'}")
-        return schedules
+        return _read_through(('day', day or None), _load_schedules_by_day, day)
+    except Exception as e:
+        logger.error("Error getting schedules: %s", e)
+        return []
+
+def _load_schedules_by_day(day):
+    """Query the schedules of one day, or of every day when day is None"""
+    schedules = list(iter_schedules(day))
+    logger.debug("Found %s schedules for day: %s", len(schedules), day if day else 'all')
+    return schedules
+
+@timed(logger)
+def get_schedules_in_range(day, start, end):
+    """Get schedules on a day that overlap the window from start to end
+    
+    Args:
+        day (str or int): Day name or weekday number (Monday = 0)
+        start (str or int): Window start as '9:00 AM' or minutes since midnight
+        end (str or int): Window end as '5:00 PM' or minutes since midnight
         
+    Returns:
+        list: ScheduleRecord for each overlapping schedule, by start time
+    """
+    try:
+        weekday = parse_weekday(day)
+        start_minute = start if isinstance(start, int) else parse_time(start)
+        end_minute = end if isinstance(end, int) else parse_time(end)
+        return _read_through(('range', weekday, start_minute, end_minute),
+                             _load_schedules_in_range, weekday, start_minute, end_minute)
     except Exception as e:
-        print(f"[DEBUG] Error getting schedules: {str(e)}")
+        logger.error("Error getting schedules in range: %s", e)
         return []
 
+def _load_schedules_in_range(weekday, start_minute, end_minute):
+    """Query schedules overlapping a window using the weekday index"""
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = _schedule_row
+    
+    cursor.execute(f'''
+        SELECT {_SCHEDULE_COLUMNS}
+        FROM schedules s
+        JOIN professors p ON s.professor_id = p.id
+        WHERE s.weekday = ? AND s.start_minute < ? AND s.end_minute > ?
+        ORDER BY s.start_minute
+    ''', (weekday, end_minute, start_minute))
+    return cursor.fetchall()
+
+@timed(logger)
 def update_single_schedule(schedule_id, day, start_time, end_time, subject):
     """Update a professor's schedule
     
@@ -810,38 +2726,42 @@ def update_single_schedule(schedule_id, day, start_time, end_time, subject):
     Returns:
         bool: True if schedule was updated successfully, False otherwise
     """
+    conn = None
     try:
         if not all([schedule_id, day, start_time, end_time, subject]):
-            print("[DEBUG] Missing required fields")
+            logger.debug("Missing required fields")
             return False
             
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        # Check and update in one write transaction, as add_schedule does
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('SELECT professor_id FROM schedules WHERE id = ?', (schedule_id,))
+        owner = cursor.fetchone()
+        if owner and _stored_conflicts(cursor, owner['professor_id'], day, start_time, end_time,
+                                       ignore_id=schedule_id):
+            conn.rollback()
+            logger.debug("Schedule %s would overlap another class", schedule_id)
+            return False
+        
         cursor.execute('''
             UPDATE schedules 
-            SET day = ?, start_time = ?, end_time = ?, subject = ?
+            SET day = ?, start_time = ?, end_time = ?, subject = ?,
+                weekday = ?, start_minute = ?, end_minute = ?
             WHERE id = ?
-        ''', (day, start_time, end_time, subject, schedule_id))
+        ''', (day, start_time, end_time, subject)
+             + _schedule_numbers(day, start_time, end_time) + (schedule_id,))
         
         conn.commit()
-        print(f"[DEBUG] Updated schedule {schedule_id}")
+        _invalidate_cache()
+        if owner:
+            _mark_schedules_changed([owner['professor_id']])
+        logger.debug("Updated schedule %s", schedule_id)
         return True
         
     except Exception as e:
-        print(f"[DEBUG] Error updating schedule: {str(e)}")
+        logger.error("Error updating schedule: %s", e)
         if conn:
             conn.rollback()
         return False
-
-# Ensure database exists and is initialized
-if not os.path.exists('data'):
-    os.makedirs('data')
-    
-db_path = os.path.join('data', 'professor_checker.db')
-if not os.path.exists(db_path):
-    conn = get_db_connection()
-    init_db()
-
-# Register database cleanup
-atexit.register(close_db)
@@ -0,0 +1,248 @@
+"""Import and export the directory from the command line
+
+Professors, schedules and users are streamed to and from CSV or JSON
+Lines without loading the whole file, so memory stays flat however large
+the export is. Imports go through the bulk_add_* functions one chunk at
+a time, each chunk in its own transaction. Only database.py is loaded;
+Tk never is, so this runs on headless machines.
+
+Examples:
+    python import_export.py export professors professors.csv
+    python import_export.py export schedules - --format jsonl > schedules.jsonl
+    python import_export.py import professors registrar.csv --chunk 10000
+    python import_export.py import schedules schedules.jsonl --database data/staging.db
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import database
+from app_logging import configure_logging
+
+# Columns written on export and read on import, per table. User imports
+# also need a plain-text password column, which exports never contain.
+FIELDS = {
+    'professors': ['name', 'department', 'contact', 'email', 'picture'],
+    'schedules': ['professor', 'day', 'start_time', 'end_time', 'subject'],
+    'users': ['username', 'email', 'role']
+}
+
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl'}
+
+def _detect_format(path, requested):
+    """Pick csv or jsonl from --format or the file extension"""
+    if requested:
+        return requested
+    found = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if found is None:
+        raise ValueError(f"Cannot tell the format of {path}; pass --format csv or jsonl")
+    return found
+
+def _open(path, mode):
+    """Open path for text I/O, with '-' meaning stdin or stdout"""
+    if path == '-':
+        return open(sys.stdin.fileno() if 'r' in mode else sys.stdout.fileno(),
+                    mode, encoding='utf-8', newline='', closefd=False)
+    return open(path, mode, encoding='utf-8', newline='')
+
+class _Progress:
+    """Rows done and rows per second, rewritten in place on a terminal"""
+
+    def __init__(self, label, quiet=False):
+        self.label = label
+        self.quiet = quiet
+        self.start = time.perf_counter()
+        self.rows = 0
+
+    def rate(self):
+        return self.rows / max(time.perf_counter() - self.start, 1e-9)
+
+    def update(self, rows):
+        self.rows += rows
+        if not self.quiet:
+            end = '\r' if sys.stderr.isatty() else '\n'
+            print(f"{self.label}: {self.rows} rows ({self.rate():.0f} rows/s)",
+                  end=end, file=sys.stderr, flush=True)
+
+    def finish(self, summary=''):
+        if not self.quiet:
+            elapsed = time.perf_counter() - self.start
+            print(f"{self.label}: {self.rows} rows in {elapsed:.2f} s "
+                  f"({self.rate():.0f} rows/s){summary}", file=sys.stderr)
+
+def _export_rows(table):
+    """Stream a table's rows as dictionaries of FIELDS[table]"""
+    if table == 'professors':
+        for row in database.iter_professors():
+            yield {'name': row.name, 'department': row.department, 'contact': row.contact,
+                   'email': row.email, 'picture': row.picture}
+    elif table == 'schedules':
+        for row in database.iter_schedules():
+            yield {'professor': row.professor_name, 'day': row.day, 'start_time': row.start_time,
+                   'end_time': row.end_time, 'subject': row.subject}
+    else:
+        # Password hashes are never exported
+        for row in database.iter_users():
+            yield {'username': row.username, 'email': row.email, 'role': row.role}
+
+def export_table(table, path, fmt, quiet=False, flush_every=5000):
+    """Write every row of a table to path
+
+    Returns:
+        int: Rows written
+    """
+    progress = _Progress(f"Exporting {table}", quiet)
+    fields = FIELDS[table]
+    with _open(path, 'w') as f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda row: f.write(json.dumps(row) + '\n')
+
+        pending = 0
+        for row in _export_rows(table):
+            write(row)
+            pending += 1
+            if pending == flush_every:
+                progress.update(pending)
+                pending = 0
+        progress.update(pending)
+    progress.finish()
+    return progress.rows
+
+def _read_rows(path, fmt):
+    """Yield (row number, dict) pairs from a CSV or JSON Lines file"""
+    with _open(path, 'r') as f:
+        if fmt == 'csv':
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield number, row
+        else:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"line {number}: {e}") from None
+
+def _chunks(rows, size):
+    """Group an iterator into lists of at most size items"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _schedule_row(row):
+    """CSV gives strings; turn a numeric professor_id back into an int"""
+    professor_id = row.get('professor_id')
+    if isinstance(professor_id, str):
+        row = dict(row, professor_id=int(professor_id) if professor_id.strip().isdigit() else None)
+    return row
+
+def _import_chunk(table, rows, allow_conflicts, processes):
+    """Insert one chunk; returns (added, [(index in chunk, message), ...])"""
+    if table == 'professors':
+        return database.bulk_add_professors(rows)
+    if table == 'schedules':
+        return database.bulk_add_schedules([_schedule_row(row) for row in rows], allow_conflicts)
+
+    errors = []
+    users = []
+    for index, row in enumerate(rows):
+        if not row.get('username') or not row.get('password'):
+            errors.append((index, "Username and password are required"))
+        else:
+            users.append((row['username'], row['password'], row.get('email') or '',
+                          row.get('role') or 'student'))
+    added = database.bulk_add_users(users, processes)
+    if added is None:
+        # Nothing in the chunk was written; the cause is in the log
+        errors.append((None, f"Database error: {len(users)} users not added (see log)"))
+        return 0, errors
+    skipped = len(users) - added
+    if skipped:
+        errors.append((None, f"{skipped} users skipped (username taken)"))
+    return added, errors
+
+def import_table(table, path, fmt, chunk_size=5000, allow_conflicts=False,
+                 processes=None, quiet=False):
+    """Load a file into a table, committing one chunk at a time
+
+    Rejected rows are reported on stderr by their row number in the file
+    and do not stop the import.
+
+    Returns:
+        tuple: (rows added, rows rejected, whether a chunk hit a database error)
+    """
+    progress = _Progress(f"Importing {table}", quiet)
+    added = rejected = 0
+    failed = False
+    for chunk in _chunks(_read_rows(path, fmt), chunk_size):
+        numbers = [number for number, _ in chunk]
+        chunk_added, errors = _import_chunk(table, [row for _, row in chunk],
+                                            allow_conflicts, processes)
+        added += chunk_added
+        rejected += len(chunk) - chunk_added
+        for index, message in errors:
+            if index is None:
+                failed = failed or message.startswith('Database error')
+                where = f"rows {numbers[0]}-{numbers[-1]}"
+            else:
+                where = f"row {numbers[index]}"
+            print(f"{where}: {message}", file=sys.stderr)
+        progress.update(len(chunk))
+    progress.finish(f", {added} added, {rejected} rejected")
+    return added, rejected, failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('table', choices=sorted(FIELDS))
+    parser.add_argument('path', help="File to read or write, or '-' for stdin/stdout")
+    parser.add_argument('--format', choices=['csv', 'jsonl'],
+                        help='File format (default: from the file extension)')
+    parser.add_argument('--database', help='Database path, file: URI or memory:<name> (default: PROFBOOK_DB)')
+    parser.add_argument('--chunk', type=int, default=5000,
+                        help='Rows per import transaction (default: 5000)')
+    parser.add_argument('--allow-conflicts', action='store_true',
+                        help='Import schedules even if they overlap another class')
+    parser.add_argument('--processes', type=int,
+                        help='Password hashing processes for user imports (default: every CPU)')
+    parser.add_argument('--quiet', action='store_true', help='No progress output')
+    args = parser.parse_args(argv)
+
+    if args.path == '-' and not args.format:
+        parser.error("--format is required when reading stdin or writing stdout")
+    try:
+        fmt = _detect_format(args.path, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    configure_logging()
+    if args.database:
+        database.configure(args.database)
+    try:
+        if args.action == 'export':
+            export_table(args.table, args.path, fmt, args.quiet)
+            return 0
+        _, _, failed = import_table(args.table, args.path, fmt, max(1, args.chunk),
+                                    args.allow_conflicts, args.processes, args.quiet)
+        return 1 if failed else 0
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        database.close_db()
+
+if __name__ == '__main__':
+    sys.exit(main())
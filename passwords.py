@@ -0,0 +1,184 @@
+"""Password hashing with a tunable key-derivation function
+
+Hashes are stored as '$'-separated records that carry their own
+parameters, for example
+
+    scrypt$32768$8$1$<salt>$<hash>
+    pbkdf2_sha256$600000$<salt>$<hash>
+
+so the cost can be raised later without invalidating existing hashes:
+needs_rehash() reports hashes made with weaker settings, and verify_user
+re-hashes them after a successful login. Bare 64-character hex strings are
+the unsalted SHA-256 hashes of older databases and are still accepted.
+
+Hashing is deliberately slow; UI code should call it from a worker thread.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+
+_SALT_BYTES = 16
+_HASH_BYTES = 32
+_SCRYPT_SLACK = 1024 * 1024  # Extra maxmem over scrypt's own estimate
+
+# Current cost settings; raise them over time as hardware gets faster
+_policy = {
+    'scheme': 'scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2_sha256',
+    'scrypt_n': int(os.environ.get('PROFBOOK_SCRYPT_N', 2 ** 15)),
+    'scrypt_r': 8,
+    'scrypt_p': 1,
+    'pbkdf2_iterations': int(os.environ.get('PROFBOOK_PBKDF2_ITERATIONS', 600000))
+}
+
+def set_cost(scheme=None, scrypt_n=None, scrypt_r=None, scrypt_p=None, pbkdf2_iterations=None):
+    """Change the parameters used for new hashes
+
+    Existing hashes keep working; they are upgraded as users log in.
+
+    Raises:
+        ValueError: If the scheme is unknown or unavailable
+    """
+    if scheme is not None:
+        if scheme not in ('scrypt', 'pbkdf2_sha256'):
+            raise ValueError(f"Unknown password scheme: {scheme}")
+        if scheme == 'scrypt' and not hasattr(hashlib, 'scrypt'):
+            raise ValueError("This Python's hashlib has no scrypt")
+        _policy['scheme'] = scheme
+    for name, value in (('scrypt_n', scrypt_n), ('scrypt_r', scrypt_r),
+                        ('scrypt_p', scrypt_p), ('pbkdf2_iterations', pbkdf2_iterations)):
+        if value is not None:
+            _policy[name] = int(value)
+
+def get_cost():
+    """Get a copy of the current cost settings"""
+    return dict(_policy)
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii')
+
+def _b64decode(text):
+    return base64.b64decode(text.encode('ascii'))
+
+def _derive(scheme, password, salt, params):
+    """Run the KDF for one scheme with explicit parameters"""
+    if scheme == 'scrypt':
+        n, r, p = params
+        # scrypt needs about 128 * r * (n + p) bytes; allow some slack on top
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=128 * r * (n + p) + _SCRYPT_SLACK, dklen=_HASH_BYTES)
+    (iterations,) = params
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations, dklen=_HASH_BYTES)
+
+def hash_password(password, policy=None):
+    """Hash a password with a fresh salt
+
+    Args:
+        password (str): Plain-text password
+        policy (dict, optional): Cost settings; defaults to get_cost()
+
+    Returns:
+        str: Self-describing hash record to store
+    """
+    policy = policy or _policy
+    salt = os.urandom(_SALT_BYTES)
+    if policy['scheme'] == 'scrypt':
+        params = (policy['scrypt_n'], policy['scrypt_r'], policy['scrypt_p'])
+    else:
+        params = (policy['pbkdf2_iterations'],)
+    digest = _derive(policy['scheme'], password, salt, params)
+    fields = [policy['scheme']] + [str(value) for value in params] + [_b64encode(salt), _b64encode(digest)]
+    return '$'.join(fields)
+
+def _is_legacy(stored):
+    """Whether stored is a bare unsalted SHA-256 hex digest"""
+    if len(stored) != 64:
+        return False
+    try:
+        int(stored, 16)
+    except ValueError:
+        return False
+    return True
+
+def verify_password(password, stored):
+    """Check a password against a stored hash record or legacy digest
+
+    Returns:
+        bool: True if the password matches; False for a mismatch or an
+            unreadable record
+    """
+    if not stored:
+        return False
+    if _is_legacy(stored):
+        digest = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(digest, stored.lower())
+
+    fields = stored.split('$')
+    try:
+        if fields[0] == 'scrypt' and len(fields) == 6:
+            params = tuple(int(value) for value in fields[1:4])
+        elif fields[0] == 'pbkdf2_sha256' and len(fields) == 4:
+            params = (int(fields[1]),)
+        else:
+            return False
+        salt, expected = _b64decode(fields[-2]), _b64decode(fields[-1])
+        digest = _derive(fields[0], password, salt, params)
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(digest, expected)
+
+def needs_rehash(stored, policy=None):
+    """Whether a stored hash is legacy or weaker than the current settings"""
+    policy = policy or _policy
+    if not stored or _is_legacy(stored):
+        return True
+    fields = stored.split('$')
+    try:
+        if fields[0] != policy['scheme']:
+            return True
+        if fields[0] == 'scrypt':
+            n, r, p = (int(value) for value in fields[1:4])
+            return n < policy['scrypt_n'] or r < policy['scrypt_r'] or p < policy['scrypt_p']
+        return int(fields[1]) < policy['pbkdf2_iterations']
+    except (ValueError, IndexError):
+        return True
+
+def _hash_with_policy(args):
+    password, policy = args
+    return hash_password(password, policy)
+
+def _verify_pair(args):
+    password, stored = args
+    return verify_password(password, stored)
+
+def _map(func, items, processes):
+    """Run func over items inline or on a process pool"""
+    if processes == 0 or len(items) < 2:
+        return [func(item) for item in items]
+    # Imported here: multiprocessing is slow to load and most callers never need it
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(func, items, chunksize=max(1, len(items) // (4 * (processes or os.cpu_count() or 1)))))
+
+def hash_passwords(passwords, processes=None):
+    """Hash many passwords, spreading the work across processes
+
+    Args:
+        passwords (iterable): Plain-text passwords
+        processes (int, optional): Pool size; None uses every CPU and 0
+            hashes inline in this process
+
+    Returns:
+        list: Hash records in the same order
+    """
+    policy = dict(_policy)
+    return _map(_hash_with_policy, [(password, policy) for password in passwords], processes)
+
+def verify_passwords(pairs, processes=None):
+    """Verify many (password, stored) pairs, spreading the work across processes
+
+    Returns:
+        list: One bool per pair, in the same order
+    """
+    return _map(_verify_pair, list(pairs), processes)
@@ -0,0 +1,253 @@
+"""Opt-in SQL instrumentation for database connections
+
+When enabled, database.py opens connections with TracingConnection. Every
+statement run through it is timed from execute until its rows have been
+fetched. Timings are grouped by normalized statement text, and statements
+slower than the threshold are written to the slow-query log.
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+import sqlite3
+from collections import deque
+
+from app_logging import get_logger
+
+logger = get_logger('sql')
+slow_logger = get_logger('sql.slow')
+
+_MAX_SAMPLES = 1000  # Durations kept per statement for percentiles
+
+_stats_lock = threading.Lock()
+_stats = {}
+_traced_statements = 0
+_slow_ms = float(os.environ.get('PROFBOOK_SLOW_QUERY_MS', 100))
+_slow_handler = None
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_WHITESPACE = re.compile(r'\s+')
+
+class _StatementStats:
+    """Running totals and recent durations for one normalized statement"""
+    __slots__ = ('count', 'total_ms', 'rows', 'params', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.params = 0
+        self.samples = deque(maxlen=_MAX_SAMPLES)
+
+def normalize_sql(sql):
+    """Reduce a statement to a stable key
+
+    Literals become ?, placeholder lists collapse to "?, ..." and
+    whitespace is squeezed, so the same query with different values or
+    IN-list lengths is counted together.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('?, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+def _param_count(params):
+    """Count bound parameters for one execute call"""
+    try:
+        return len(params)
+    except TypeError:
+        return 0
+
+def _record(sql, params, duration_ms, rows):
+    """Add one finished statement to the stats and the slow-query log"""
+    key = normalize_sql(sql)
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = _StatementStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.rows += rows
+        stats.params = params
+        stats.samples.append(duration_ms)
+
+    if duration_ms >= _slow_ms:
+        slow_logger.warning('%.1f ms, %s rows, %s params: %s',
+                            duration_ms, rows, params, key,
+                            extra={'duration_ms': round(duration_ms, 3)})
+
+def _trace_statement(statement):
+    """sqlite3 trace callback: count every statement SQLite runs
+
+    This also sees statements the cursor wrappers cannot time, such as
+    trigger bodies and implicit COMMITs.
+    """
+    global _traced_statements
+
+    with _stats_lock:
+        _traced_statements += 1
+    logger.debug('%s', statement)
+
+class TracingCursor(sqlite3.Cursor):
+    """Cursor that times each statement until its rows are consumed"""
+
+    _pending = None
+
+    def _begin(self, sql, params, run):
+        self._finish()
+        start = time.perf_counter()
+        result = run()
+        elapsed = (time.perf_counter() - start) * 1000
+        if self.description is None:
+            # No result set: the work is done, rowcount is what changed
+            _record(sql, params, elapsed, max(self.rowcount, 0))
+        else:
+            self._pending = [sql, params, elapsed, 0]
+        return result
+
+    def _fetched(self, start, rows, exhausted):
+        pending = self._pending
+        if pending is not None:
+            pending[2] += (time.perf_counter() - start) * 1000
+            pending[3] += rows
+            if exhausted:
+                self._finish()
+
+    def _finish(self):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            _record(*pending)
+
+    def execute(self, sql, parameters=()):
+        return self._begin(sql, _param_count(parameters),
+                           lambda: super(TracingCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        params = sum(_param_count(p) for p in seq_of_parameters)
+        return self._begin(sql, params,
+                           lambda: super(TracingCursor, self).executemany(sql, seq_of_parameters))
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows), len(rows) < (self.arraysize if size is None else size))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(start, 0, True)
+            raise
+        self._fetched(start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Single-row lookups never exhaust the cursor; record them here
+        self._finish()
+
+class TracingConnection(sqlite3.Connection):
+    """Connection whose cursors, including conn.execute(), are traced"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_trace_statement)
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def configure(slow_ms=None, slow_log_path=None):
+    """Set the slow-query threshold and (re)open the slow-query log file
+
+    Args:
+        slow_ms (float, optional): Threshold in milliseconds
+        slow_log_path (str, optional): File that receives slow statements;
+            without one they still go to the 'profbook.sql.slow' logger
+    """
+    global _slow_ms, _slow_handler
+
+    if slow_ms is not None:
+        _slow_ms = float(slow_ms)
+
+    if _slow_handler is not None:
+        slow_logger.removeHandler(_slow_handler)
+        _slow_handler.close()
+        _slow_handler = None
+
+    if slow_log_path:
+        _slow_handler = logging.FileHandler(slow_log_path, encoding='utf-8')
+        _slow_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        slow_logger.addHandler(_slow_handler)
+        slow_logger.setLevel(logging.WARNING)
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def summary():
+    """Summarize recorded statements, slowest total time first
+
+    Returns:
+        dict: 'statements' (list of per-statement dicts with sql, count,
+            params, rows, total_ms, p50_ms, p95_ms, p99_ms and max_ms),
+            'traced' (statements seen by the trace callback) and
+            'slow_ms' (current threshold)
+    """
+    with _stats_lock:
+        items = [(sql, s.count, s.params, s.rows, s.total_ms, sorted(s.samples))
+                 for sql, s in _stats.items()]
+        traced = _traced_statements
+
+    statements = []
+    for sql, count, params, rows, total_ms, ordered in items:
+        statements.append({
+            'sql': sql,
+            'count': count,
+            'params': params,
+            'rows': rows,
+            'total_ms': round(total_ms, 3),
+            'p50_ms': round(_percentile(ordered, 0.50), 3),
+            'p95_ms': round(_percentile(ordered, 0.95), 3),
+            'p99_ms': round(_percentile(ordered, 0.99), 3),
+            'max_ms': round(ordered[-1], 3)
+        })
+    statements.sort(key=lambda s: s['total_ms'], reverse=True)
+    return {'statements': statements, 'traced': traced, 'slow_ms': _slow_ms}
+
+def reset():
+    """Forget every recorded statement"""
+    global _traced_statements
+
+    with _stats_lock:
+        _stats.clear()
+        _traced_statements = 0
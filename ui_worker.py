@@ -0,0 +1,288 @@
+"""Run database and image work off the Tk thread
+
+Tk widgets may only be touched from the thread running mainloop(), so
+DbWorker runs calls on a small thread pool and hands the results back
+through a queue that the Tk thread drains with root.after(). Each call is
+submitted under a key; a newer call with the same key supersedes the older
+one, whose result is dropped instead of being delivered.
+"""
+
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+from app_logging import get_logger
+
+logger = get_logger('ui.worker')
+
+_POLL_MS = 16  # About one frame at 60 fps
+_BATCH_ROWS = 500  # Rows inserted per frame when filling large widgets
+
+class DbWorker:
+    """Thread pool whose results are delivered on the Tk thread"""
+
+    def __init__(self, root, max_workers=2):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='profbook-db')
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._futures = {}
+        self._polling = False
+        self._closed = False
+
+    def submit(self, key, func, *args, on_success=None, on_error=None):
+        """Run func(*args) on a worker thread
+
+        Args:
+            key (str): Request slot; a later submit with the same key
+                cancels or discards this one
+            func (callable): Work to run off the Tk thread
+            on_success (callable, optional): Called on the Tk thread with
+                the result
+            on_error (callable, optional): Called on the Tk thread with the
+                exception; it is logged either way
+
+        Returns:
+            int: Token identifying this request within its key
+        """
+        if self._closed:
+            return None
+        with self._lock:
+            token = self._tokens.get(key, 0) + 1
+            self._tokens[key] = token
+            previous = self._futures.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+        future = self._executor.submit(func, *args)
+        with self._lock:
+            self._futures[key] = future
+        future.add_done_callback(
+            lambda f: self._results.put((key, token, f, on_success, on_error)))
+        self._ensure_polling()
+        return token
+
+    def is_current(self, key, token):
+        """Whether token is still the latest request for key"""
+        with self._lock:
+            return self._tokens.get(key) == token
+
+    def cancel(self, key):
+        """Drop any pending or running request for key"""
+        with self._lock:
+            self._tokens[key] = self._tokens.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            try:
+                self.root.after(_POLL_MS, self._drain)
+            except tk.TclError:
+                self._polling = False
+
+    def _drain(self):
+        """Deliver finished results on the Tk thread"""
+        self._polling = False
+        while True:
+            try:
+                key, token, future, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or not self.is_current(key, token):
+                continue
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+            error = future.exception()
+            try:
+                if error is not None:
+                    logger.error("Background %s failed: %s", key, error)
+                    if on_error:
+                        on_error(error)
+                elif on_success:
+                    on_success(future.result())
+            except tk.TclError as e:
+                # The widgets went away while the work was running
+                logger.debug("Dropped %s result: %s", key, e)
+
+        with self._lock:
+            pending = bool(self._futures)
+        if pending and not self._closed:
+            self._ensure_polling()
+
+    def fill_in_batches(self, key, rows, insert_row, done=None, batch=_BATCH_ROWS):
+        """Insert rows into a widget a batch per frame so redraws keep up
+
+        A newer fill (or submit) with the same key stops this one.
+
+        Args:
+            key (str): Request slot shared with submit()
+            rows (list): Items to insert
+            insert_row (callable): Called on the Tk thread for each item
+            done (callable, optional): Called after the last batch
+        """
+        with self._lock:
+            token = self._tokens.get(key, 0) + 1
+            self._tokens[key] = token
+
+        def step(start):
+            if self._closed or not self.is_current(key, token):
+                return
+            try:
+                for row in rows[start:start + batch]:
+                    insert_row(row)
+                if start + batch < len(rows):
+                    self.root.after(1, step, start + batch)
+                elif done:
+                    done()
+            except tk.TclError as e:
+                logger.debug("Stopped filling %s: %s", key, e)
+
+        step(0)
+
+    def shutdown(self):
+        """Stop delivering results and let running work finish in the background"""
+        self._closed = True
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+class PagedTreeLoader:
+    """Fill a Treeview page by page as the user scrolls towards the end
+
+    Only the first page is fetched up front, so the first paint costs the
+    same however large the table is. The tree's yscrollcommand is routed
+    through the loader, which asks for the next page once the view nears
+    the bottom. Each row's id becomes its item id, so callers read the
+    primary key straight from tree.selection().
+    """
+
+    def __init__(self, worker, tree, scrollbar, key, fetch_page, row_values,
+                 sort=None, page_size=200, change_marker=None):
+        """
+        Args:
+            worker (DbWorker): Runs the page queries off the Tk thread
+            tree (ttk.Treeview): Tree to fill
+            scrollbar (ttk.Scrollbar): The tree's vertical scrollbar
+            key (str): Worker request slot for this tree
+            fetch_page (callable): fetch_page(after, limit, sort) returning
+                (rows, next_cursor), e.g. database.get_users_page; rows
+                need an id field
+            row_values (callable): Turns a row into the tree item's values
+            sort (str, optional): Initial sort key passed to fetch_page
+            page_size (int, optional): Rows fetched per page
+            change_marker (callable, optional): Returns a value that moves
+                when the data may have changed, e.g.
+                database.get_change_marker; refresh() skips the re-read
+                while it stays put
+        """
+        self.worker = worker
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.key = key
+        self.fetch_page = fetch_page
+        self.row_values = row_values
+        self.sort = sort
+        self.page_size = page_size
+        self.change_marker = change_marker
+        self._markers = {}  # Worker thread id -> marker it last saw
+        self.loaded = 0
+        self._next = None
+        self._loading = False
+        tree.configure(yscrollcommand=self._on_scroll)
+
+    def reload(self, sort=None, keep_loaded=False):
+        """Start again from the first page
+
+        Args:
+            sort (str, optional): New sort key
+            keep_loaded (bool, optional): Fetch as many rows as are shown
+                now and keep the scroll position, for periodic refreshes
+        """
+        if sort is not None:
+            self.sort = sort
+            keep_loaded = False
+        limit = max(self.page_size, self.loaded) if keep_loaded else self.page_size
+        position = self.tree.yview()[0] if keep_loaded else 0.0
+        self._loading = True
+        self.worker.submit(self.key, self._fetch, None, limit,
+                           on_success=lambda result: self._show(result, True, position),
+                           on_error=self._failed)
+
+    def refresh(self):
+        """Periodic refresh: re-read the loaded rows only if data changed
+
+        Re-reading costs as much as everything scrolled into view, so
+        without a change marker this is reload(keep_loaded=True).
+        """
+        if self.change_marker is None:
+            self.reload(keep_loaded=True)
+            return
+        if self._loading:
+            return  # A fetch in flight already sees the latest data
+        limit = max(self.page_size, self.loaded)
+        position = self.tree.yview()[0]
+        self._loading = True
+        self.worker.submit(self.key, self._fetch_if_changed, limit,
+                           on_success=lambda result: self._show_if_changed(result, position),
+                           on_error=self._failed)
+
+    def _fetch_if_changed(self, limit):
+        # Markers are per connection, and connections per thread
+        thread_id = threading.get_ident()
+        marker = self.change_marker()
+        if marker is not None and self._markers.get(thread_id) == marker:
+            return None
+        self._markers[thread_id] = marker
+        return self._fetch(None, limit)
+
+    def _show_if_changed(self, result, position):
+        if result is None:
+            self._loading = False
+        else:
+            self._show(result, True, position)
+
+    def _fetch(self, after, limit):
+        if self.sort is None:
+            return self.fetch_page(after, limit)
+        return self.fetch_page(after, limit, self.sort)
+
+    def _show(self, result, replace, position=None):
+        rows, next_cursor = result
+        if replace:
+            self.tree.delete(*self.tree.get_children())
+            self.loaded = 0
+        self._next = next_cursor
+        self.loaded += len(rows)
+
+        def finished():
+            self._loading = False
+            if position:
+                self.tree.yview_moveto(position)
+
+        self.worker.fill_in_batches(self.key, rows, self._insert, done=finished)
+
+    def _insert(self, row):
+        # A row edited between two page fetches can come back on the next page
+        if not self.tree.exists(row.id):
+            self.tree.insert('', 'end', iid=row.id, values=self.row_values(row))
+
+    def _failed(self, error):
+        self._loading = False
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.9 and self._next is not None and not self._loading:
+            self._loading = True
+            self.worker.submit(self.key, self._fetch, self._next, self.page_size,
+                               on_success=lambda result: self._show(result, False),
+                               on_error=self._failed)